@@ -10,6 +10,7 @@ Description: 动态权限管理模块
 import time
 import logging
 from enum import Enum
+from types import MappingProxyType
 from typing import List
 
 logger = logging.getLogger(__name__)
@@ -40,7 +41,7 @@ class DynamicAccessControl:
         self.operations = 0
         self.total_time = 0.0
 
-        self.role_permissions = {
+        self._role_permissions = {
             "merchant": {
                 "operations": ["read", "update"],
                 "accessible_fields": ["order_id", "product_list", "order_status", "order_time"],
@@ -63,10 +64,42 @@ class DynamicAccessControl:
             }
         }
 
+        # 只读视图：权限规则只能通过 update_role_permissions 修改，保证下方缓存同步失效
+        self.role_permissions = MappingProxyType(self._role_permissions)
+
+        # 访问决策只取决于(role, resource_type, operation)，字段掩码只取决于角色，首次计算后缓存
+        self._decision_cache = {}
+        self._field_masks = {}
+
+    def update_role_permissions(self, role: str, role_config: dict):
+        """新增或替换角色权限规则，并清空访问决策与字段掩码缓存"""
+        self._role_permissions[role] = {key: list(value) for key, value in role_config.items()}
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """清空访问决策与字段掩码缓存"""
+        self._decision_cache.clear()
+        self._field_masks.clear()
+
     def verify_access(self, user_id: str, role: str, resource_type: str, operation: str) -> AccessResult:
         """验证用户访问权限"""
         start_time = time.time()
 
+        cache_key = (role, resource_type, operation)
+        cached = self._decision_cache.get(cache_key)
+        if cached is None:
+            result = self._evaluate_access(role, operation)
+            cached = self._decision_cache[cache_key] = (
+                result.granted, result.access_level, tuple(result.allowed_fields), result.reason)
+
+        # 缓存中保存不可变的决策字段，每次返回新的结果对象，调用方修改结果不会影响缓存
+        granted, access_level, allowed_fields, reason = cached
+        if granted:
+            self._update_stats(time.time() - start_time)
+        return AccessResult(granted, access_level, list(allowed_fields), reason)
+
+    def _evaluate_access(self, role: str, operation: str) -> AccessResult:
+        """计算访问决策（不含缓存）"""
         if role not in self.role_permissions:
             return AccessResult(False, AccessLevel.DENIED, [], f"Unknown role: {role}")
 
@@ -85,31 +118,31 @@ class DynamicAccessControl:
             access_level = AccessLevel.ADMIN
 
         allowed_fields = role_config.get("accessible_fields", [])
-        self._update_stats(time.time() - start_time)
 
         return AccessResult(True, access_level, allowed_fields, "Access granted")
 
     def filter_data_fields(self, data: dict, user_role: str) -> dict:
         """根据用户角色过滤数据字段"""
-        if user_role not in self.role_permissions:
-            return {}
-
+        mask = self._field_masks.get(user_role)
+        if mask is None:
+            if user_role not in self.role_permissions:
+                return {}
+            mask = self._field_masks[user_role] = self._build_field_mask(user_role)
+
+        wildcard, fields = mask
+        if wildcard:
+            return {key: value for key, value in data.items() if key not in fields}
+        return {field: data[field] for field in fields if field in data}
+
+    def _build_field_mask(self, user_role: str) -> tuple:
+        """构建角色字段掩码：(是否通配, 禁止字段集合或允许字段元组)"""
         role_config = self.role_permissions[user_role]
         accessible_fields = role_config.get("accessible_fields", [])
-        forbidden_fields = role_config.get("forbidden_fields", [])
-
-        filtered_data = {}
+        forbidden_fields = frozenset(role_config.get("forbidden_fields", []))
 
         if "*" in accessible_fields:
-            for key, value in data.items():
-                if key not in forbidden_fields:
-                    filtered_data[key] = value
-        else:
-            for field in accessible_fields:
-                if field in data and field not in forbidden_fields:
-                    filtered_data[field] = data[field]
-
-        return filtered_data
+            return True, forbidden_fields
+        return False, tuple(field for field in accessible_fields if field not in forbidden_fields)
 
     def _update_stats(self, operation_time: float):
         """更新性能统计"""
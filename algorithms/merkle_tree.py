@@ -7,13 +7,16 @@ Created: 2025-06-13 08:47:13
 Description: Merkle树生成与验证
 """
 
-import hashlib
 import time
 import logging
-from typing import List
+from typing import Dict, List, Tuple
+from config.settings import HASH_FN
 
 logger = logging.getLogger(__name__)
 
+# 哈希构造函数由settings固定配置（默认SHA-256，可通过HASH_ALGORITHM环境变量显式切换）
+_merkle_hasher = HASH_FN
+
 
 class MerkleTree:
     """Merkle树实现"""
@@ -21,12 +24,13 @@ class MerkleTree:
     def __init__(self):
         self.root_hash = None
         self.leaves = []
+        self.levels = []
         self.operations = 0
         self.total_time = 0.0
 
     def _hash_data(self, data: str) -> str:
         """计算数据哈希"""
-        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+        return _merkle_hasher(data.encode('utf-8')).hexdigest()
 
     def build_tree(self, data_blocks: List[str]) -> str:
         """构建Merkle树"""
@@ -37,6 +41,7 @@ class MerkleTree:
 
         current_level = [self._hash_data(block) for block in data_blocks]
         self.leaves = current_level[:]
+        levels = [current_level]
 
         while len(current_level) > 1:
             next_level = []
@@ -46,7 +51,9 @@ class MerkleTree:
                 combined = self._hash_data(left + right)
                 next_level.append(combined)
             current_level = next_level
+            levels.append(current_level)
 
+        self.levels = levels
         self.root_hash = current_level[0]
         self._update_stats(time.time() - start_time)
         return self.root_hash
@@ -89,6 +96,54 @@ class MerkleTree:
 
         return proof
 
+    def generate_proofs(self, data_blocks: List[str]) -> Dict[str, List[dict]]:
+        """批量生成Merkle证明（直接读取构建时保存的各层哈希，不再逐个证明重算整棵树）"""
+        if not self.root_hash:
+            return {block: [] for block in data_blocks}
+
+        leaf_index = {}
+        for i, leaf in enumerate(self.leaves):
+            leaf_index.setdefault(leaf, i)
+
+        proofs = {}
+        for data_block in data_blocks:
+            index = leaf_index.get(self._hash_data(data_block))
+            if index is None:
+                proofs[data_block] = []
+                continue
+
+            proof = []
+            for level in self.levels[:-1]:
+                if index % 2 == 0:
+                    sibling_index = index + 1 if index + 1 < len(level) else index
+                    direction = "right"
+                else:
+                    sibling_index = index - 1
+                    direction = "left"
+                proof.append({"hash": level[sibling_index], "direction": direction})
+                index //= 2
+            proofs[data_block] = proof
+
+        return proofs
+
+    def verify_proofs_batch(self, proof_pairs: List[Tuple[str, List[dict]]], root_hash: str) -> List[bool]:
+        """批量验证Merkle证明（公共祖先节点的哈希只计算一次）"""
+        parents = {}
+        results = []
+        for data_block, proof in proof_pairs:
+            current_hash = self._hash_data(data_block)
+            for element in proof:
+                if element["direction"] == "left":
+                    pair = (element["hash"], current_hash)
+                else:
+                    pair = (current_hash, element["hash"])
+                parent = parents.get(pair)
+                if parent is None:
+                    parent = parents[pair] = self._hash_data(pair[0] + pair[1])
+                current_hash = parent
+            results.append(current_hash == root_hash)
+        return results
+
     def verify_proof(self, data_block: str, proof: List[dict], root_hash: str) -> bool:
         """验证Merkle证明"""
         current_hash = self._hash_data(data_block)
@@ -10,18 +10,67 @@ Description: Shamir秘密共享算法
 import random
 import time
 import logging
+import operator
+from functools import lru_cache
 from typing import List, Tuple
 from sympy import mod_inverse
-from config.settings import ALGORITHM_CONFIG
+from config.settings import ALGORITHM_CONFIG, SHAMIR_PRIME
 
 logger = logging.getLogger(__name__)
 
 
+def _eval_polynomial(coeffs: List[int], x: int, p: int) -> int:
+    """Horner法在有限域上求多项式值（coeffs按常数项在前排列）"""
+    acc = 0
+    for c in reversed(coeffs):
+        acc = (acc * x + c) % p
+    return acc
+
+
+@lru_cache(maxsize=64)
+def _vandermonde_rows(n: int, k: int, p: int) -> Tuple[Tuple[int, ...], ...]:
+    """预计算x=1..n的Vandermonde行 (x^0, x^1, ..., x^(k-1)) mod p"""
+    rows = []
+    for x in range(1, n + 1):
+        row = [1]
+        for _ in range(k - 1):
+            row.append(row[-1] * x % p)
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+@lru_cache(maxsize=128)
+def _lagrange_weights_at_zero(xs: Tuple[int, ...], p: int) -> Tuple[int, ...]:
+    """预计算给定横坐标在x=0处的Lagrange基系数，重构时只需做一次加权求和"""
+    numerators = []
+    denominators = []
+    for j, xj in enumerate(xs):
+        numerator = denominator = 1
+        for m, xm in enumerate(xs):
+            if m != j:
+                numerator = (numerator * -xm) % p
+                denominator = (denominator * (xj - xm)) % p
+        numerators.append(numerator)
+        denominators.append(denominator)
+
+    # 分子分母分开累乘，所有分母共用一次模逆（前缀积回推得到各自的逆元）
+    prefix = [1]
+    for denominator in denominators:
+        prefix.append(prefix[-1] * denominator % p)
+    inverse = mod_inverse(prefix[-1], p)
+
+    weights = [0] * len(xs)
+    for j in range(len(xs) - 1, -1, -1):
+        weights[j] = numerators[j] * inverse * prefix[j] % p
+        inverse = inverse * denominators[j] % p
+    return tuple(weights)
+
+
 class ShamirSecretSharing:
     """Shamir秘密共享算法实现"""
 
     def __init__(self):
-        self.prime = ALGORITHM_CONFIG["shamir"]["prime_modulus"]
+        self.prime = SHAMIR_PRIME
         self.k_min = ALGORITHM_CONFIG["shamir"]["k_min"]
         self.k_max = ALGORITHM_CONFIG["shamir"]["k_max"]
         self.operations = 0
@@ -37,13 +86,13 @@ class ShamirSecretSharing:
         start_time = time.time()
 
         k = self.calculate_dynamic_threshold(sensitivity, load, frequency)
-        coeffs = [secret] + [random.randint(1, self.prime - 1) for _ in range(k - 1)]
+        p = self.prime
+        coeffs = [secret] + [random.randint(1, p - 1) for _ in range(k - 1)]
 
         shares = []
         create_time = time.time()
         for i in range(1, n + 1):
-            y = sum(coeffs[j] * pow(i, j, self.prime) for j in range(k)) % self.prime
-            shares.append((i, y, create_time, None))
+            shares.append((i, _eval_polynomial(coeffs, i, p), create_time, None))
 
         self._update_stats(time.time() - start_time)
         return shares, coeffs, k
@@ -58,21 +107,56 @@ class ShamirSecretSharing:
         if len(valid_shares) < 2:
             return 0
 
-        secret = 0
-        for j, (xj, yj) in enumerate(valid_shares):
-            numerator = denominator = 1
-            for m, (xm, _) in enumerate(valid_shares):
-                if m != j:
-                    numerator = (numerator * -xm) % self.prime
-                    denominator = (denominator * (xj - xm)) % self.prime
-            secret = (secret + yj * numerator * mod_inverse(denominator, self.prime)) % self.prime
+        xs, ys = zip(*valid_shares)
+        weights = _lagrange_weights_at_zero(xs, self.prime)
+        secret = sum(map(operator.mul, weights, ys)) % self.prime
 
         self._update_stats(time.time() - start_time)
         return secret
 
-    def _update_stats(self, operation_time: float):
+    def share_secrets_batch(self, secrets: List[int], n: int, sensitivity: float, load: float,
+                            frequency: float) -> Tuple[List[List[Tuple]], int]:
+        """批量生成秘密分片（同一阈值下复用预计算的Vandermonde矩阵）"""
+        start_time = time.time()
+
+        k = self.calculate_dynamic_threshold(sensitivity, load, frequency)
+        p = self.prime
+        vandermonde = _vandermonde_rows(n, k, p)
+        randint = random.randint
+
+        batch_shares = []
+        create_time = time.time()
+        for secret in secrets:
+            coeffs = [secret] + [randint(1, p - 1) for _ in range(k - 1)]
+            batch_shares.append([(x, sum(map(operator.mul, row, coeffs)) % p, create_time, None)
+                                 for x, row in enumerate(vandermonde, 1)])
+
+        self._update_stats(time.time() - start_time, len(secrets))
+        return batch_shares, k
+
+    def reconstruct_secrets_batch(self, share_sets: List[List[Tuple]]) -> List[int]:
+        """批量重构秘密（相同横坐标的分片组复用预计算的Lagrange系数）"""
+        start_time = time.time()
+
+        p = self.prime
+        now = time.time()
+        secrets = []
+        for shares in share_sets:
+            valid_shares = [(x, y) for x, y, create_t, expire_t in shares
+                            if expire_t is None or now < expire_t]
+            if len(valid_shares) < 2:
+                secrets.append(0)
+                continue
+            xs, ys = zip(*valid_shares)
+            weights = _lagrange_weights_at_zero(xs, p)
+            secrets.append(sum(map(operator.mul, weights, ys)) % p)
+
+        self._update_stats(time.time() - start_time, len(share_sets))
+        return secrets
+
+    def _update_stats(self, operation_time: float, count: int = 1):
         """更新性能统计"""
-        self.operations += 1
+        self.operations += count
         self.total_time += operation_time
 
     def get_performance_stats(self) -> dict:
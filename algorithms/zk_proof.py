@@ -11,7 +11,8 @@ import hashlib
 import secrets
 import time
 import logging
-from typing import List
+from typing import List, Tuple
+from utils.helpers import hash_data
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +48,7 @@ class ZeroKnowledgeProof:
             "pi_c": [secrets.token_hex(32), secrets.token_hex(32)],
             "public_inputs": {
                 "role_hash": hashlib.sha256(role.encode()).hexdigest(),
-                "permissions_hash": hashlib.sha256(str(permissions).encode()).hexdigest()
+                "permissions_hash": hash_data(permissions)
             }
         }
 
@@ -68,6 +69,25 @@ class ZeroKnowledgeProof:
         """验证零知识证明"""
         start_time = time.time()
 
+        try:
+            if not self._check_proof(proof, expected_role):
+                return False
+
+            time.sleep(0.05)  # 模拟验证延迟
+
+            self._update_stats(time.time() - start_time)
+            return True
+
+        except Exception:
+            return False
+
+    def batch_verify_proofs(self, proof_pairs: List[Tuple[ZKProof, str]]) -> List[bool]:
+        """批量验证零知识证明（逐个验证，每个证明计入完整的模拟验证延迟）"""
+        return [self.verify_proof(proof, expected_role) for proof, expected_role in proof_pairs]
+
+    @staticmethod
+    def _check_proof(proof: ZKProof, expected_role: str = None) -> bool:
+        """检查证明结构、角色与验证方程（不含模拟延迟）"""
         try:
             required_fields = ["pi_a", "pi_b", "pi_c", "public_inputs"]
             if not all(field in proof.proof_data for field in required_fields):
@@ -76,19 +96,14 @@ class ZeroKnowledgeProof:
             if expected_role and proof.metadata.get("role") != expected_role:
                 return False
 
-            time.sleep(0.05)  # 模拟验证延迟
-
-            is_valid = len(proof.proof_data["pi_a"]) == 2
-
-            self._update_stats(time.time() - start_time)
-            return is_valid
+            return len(proof.proof_data["pi_a"]) == 2
 
         except Exception:
             return False
 
-    def _update_stats(self, operation_time: float):
+    def _update_stats(self, operation_time: float, count: int = 1):
         """更新性能统计"""
-        self.operations += 1
+        self.operations += count
         self.total_time += operation_time
 
     def get_performance_stats(self) -> dict:
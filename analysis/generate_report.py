@@ -16,6 +16,27 @@ from analysis.visualize_results import generate_all_visualizations
 
 logger = logging.getLogger(__name__)
 
+# 表格表头在模块加载时预先生成，各报告复用
+_PRIVACY_TABLE_HEADER = """
+        <h3>Privacy Protection Scores</h3>
+        <table>
+            <tr>
+                <th>Component</th>
+                <th>Score</th>
+                <th>Status</th>
+            </tr>
+        """
+
+_COMPARISON_TABLE_HEADER = """
+    <table>
+        <tr>
+            <th>System</th>
+            <th>Avg Latency (ms)</th>
+            <th>Avg Throughput (TPS)</th>
+            <th>Performance Rating</th>
+        </tr>
+    """
+
 
 def generate_comprehensive_report(experiment_results):
     """生成综合实验报告"""
@@ -284,12 +305,19 @@ def _generate_performance_section(experiment_results):
 
         if 'shamir' in algo_perf:
             shamir_metrics = algo_perf['shamir']
-            section += f"""
-            <div class="metric-box">
-                <strong>Shamir Secret Sharing Performance:</strong><br>
+            if 'batch_total_ms' in shamir_metrics:
+                # 批量计时结果只有总耗时与单次均值，没有逐次的最小/最大值
+                timing_rows = f"""
+                Batch Total Time: <span class="highlight">{shamir_metrics['batch_total_ms']:.2f} ms</span><br>
+                Mean Time per Operation: {shamir_metrics.get('mean_per_op_ms', 0):.4f} ms<br>"""
+            else:
+                timing_rows = f"""
                 Average Time: <span class="highlight">{shamir_metrics.get('avg', 0):.2f} ms</span><br>
                 Min Time: {shamir_metrics.get('min', 0):.2f} ms<br>
-                Max Time: {shamir_metrics.get('max', 0):.2f} ms<br>
+                Max Time: {shamir_metrics.get('max', 0):.2f} ms<br>"""
+            section += f"""
+            <div class="metric-box">
+                <strong>Shamir Secret Sharing Performance:</strong><br>{timing_rows}
                 Operations: {shamir_metrics.get('count', 0)}
             </div>
             """
@@ -319,16 +347,6 @@ def _generate_privacy_section(experiment_results):
 
     if 'privacy_scores' in privacy_data:
         scores = privacy_data['privacy_scores']
-        section += """
-        <h3>Privacy Protection Scores</h3>
-        <table>
-            <tr>
-                <th>Component</th>
-                <th>Score</th>
-                <th>Status</th>
-            </tr>
-        """
-
         components = [
             ("Access Control", scores.get('access_control_score', 0)),
             ("Secret Sharing", scores.get('secret_sharing_score', 0)),
@@ -336,19 +354,21 @@ def _generate_privacy_section(experiment_results):
             ("Overall Privacy", scores.get('overall_privacy_score', 0))
         ]
 
+        rows = [_PRIVACY_TABLE_HEADER]
         for name, score in components:
             status_class = "highlight" if score >= 80 else "warning" if score >= 60 else "error"
             status_text = "Excellent" if score >= 80 else "Good" if score >= 60 else "Needs Improvement"
 
-            section += f"""
+            rows.append(f"""
             <tr>
                 <td>{name}</td>
                 <td><span class="{status_class}">{score:.1f}%</span></td>
                 <td>{status_text}</td>
             </tr>
-            """
+            """)
 
-        section += "</table>"
+        rows.append("</table>")
+        section += "".join(rows)
 
     return section
 
@@ -363,15 +383,6 @@ def _generate_comparison_section(experiment_results):
 
     # 性能对比表
     section += "<h3>System Performance Comparison</h3>"
-    section += """
-    <table>
-        <tr>
-            <th>System</th>
-            <th>Avg Latency (ms)</th>
-            <th>Avg Throughput (TPS)</th>
-            <th>Performance Rating</th>
-        </tr>
-    """
 
     systems = [
         ("DVSS-PPA", comp_data.get('dvss_ppa_results', {})),
@@ -379,6 +390,7 @@ def _generate_comparison_section(experiment_results):
         ("Ethereum", comp_data.get('ethereum_simulation', {}))
     ]
 
+    rows = [_COMPARISON_TABLE_HEADER]
     for name, metrics in systems:
         latency = metrics.get('avg_latency_ms', 0)
         throughput = metrics.get('avg_throughput_tps', 0)
@@ -391,16 +403,17 @@ def _generate_comparison_section(experiment_results):
         else:
             rating = '<span class="error">Fair</span>'
 
-        section += f"""
+        rows.append(f"""
         <tr>
             <td><strong>{name}</strong></td>
             <td>{latency:.1f}</td>
             <td>{throughput:.1f}</td>
             <td>{rating}</td>
         </tr>
-        """
+        """)
 
-    section += "</table>"
+    rows.append("</table>")
+    section += "".join(rows)
 
     # 改进百分比
     if 'comparison_metrics' in comp_data:
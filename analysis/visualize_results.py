@@ -7,186 +7,227 @@ Created: 2025-06-13 08:54:05
 Description: 数据可视化工具
 """
 
+import matplotlib
+matplotlib.use('Agg')  # 无界面后端，仅输出文件
 import matplotlib.pyplot as plt
-import pandas as pd
+from matplotlib import font_manager
+import numpy as np
+import io
 import os
 import logging
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
 from config.settings import RESULTS_PATH
 
 logger = logging.getLogger(__name__)
 
-
-def visualize_performance_comparison(comparison_results):
+# 导入时一次性完成字体查找与样式设置，避免首次绘图时扫描字体缓存
+matplotlib.rcParams.update({
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['DejaVu Sans'],
+    'path.simplify_threshold': 1.0,
+    # 使用constrained layout代替tight_layout/bbox_inches='tight'，避免保存时二次渲染
+    'figure.constrained_layout.use': True
+})
+
+# 默认输出分辨率，出版级图表可显式传入 dpi=300
+CHART_DPI = 150
+font_manager.findfont('DejaVu Sans')
+
+# 图表固定数据（模块级常量，避免每次调用重复构建）
+_SYSTEMS = ('DVSS-PPA', 'Hyperledger', 'Ethereum')
+_SYSTEM_RESULT_KEYS = ('dvss_ppa_results', 'hyperledger_simulation', 'ethereum_simulation')
+_SYSTEM_COLORS = ('#2E8B57', '#4682B4', '#CD853F')
+_PRIVACY_CATEGORIES = ('Access Control', 'Secret Sharing', 'Zero Knowledge', 'Overall')
+_PRIVACY_SCORE_KEYS = ('access_control_score', 'secret_sharing_score', 'zero_knowledge_score', 'overall_privacy_score')
+_PRIVACY_COLORS = ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4')
+
+# 柱状图规格表：各图仅数据、颜色与标题不同，统一由 _draw_bar_chart 绘制
+_BAR_CHART_SPECS = {
+    'latency': {
+        'labels': _SYSTEMS,
+        'colors': _SYSTEM_COLORS,
+        'title': 'Average Latency Comparison',
+        'ylabel': 'Latency (ms)',
+        'fmt': '%.1fms',
+        'yscale': 'log'  # 使用对数刻度
+    },
+    'throughput': {
+        'labels': _SYSTEMS,
+        'colors': _SYSTEM_COLORS,
+        'title': 'Average Throughput Comparison',
+        'ylabel': 'Throughput (TPS)',
+        'fmt': '%.1f'
+    },
+    'privacy': {
+        'labels': _PRIVACY_CATEGORIES,
+        'colors': _PRIVACY_COLORS,
+        'title': 'Privacy Protection Scores',
+        'ylabel': 'Score (%)',
+        'fmt': '%.1f%%',
+        'ylim': (0, 100),
+        'label_padding': 3
+    }
+}
+
+
+def _save_palette_png(fig, chart_path, dpi=CHART_DPI, colors=64):
+    """将图表保存为8位调色板PNG（柱状图颜色少，体积可缩小数倍）"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi)
+    buf.seek(0)
+    img = Image.open(buf).convert('RGB').convert('P', palette=Image.ADAPTIVE, colors=colors)
+    img.save(chart_path, format='PNG', optimize=True)
+
+
+def _draw_bar_chart(ax, spec_name, values):
+    """按规格表在指定坐标轴上绘制带数值标签的柱状图"""
+    spec = _BAR_CHART_SPECS[spec_name]
+    bars = ax.bar(spec['labels'], values, color=spec['colors'])
+    ax.set_title(spec['title'])
+    ax.set_ylabel(spec['ylabel'])
+    if 'yscale' in spec:
+        ax.set_yscale(spec['yscale'])
+    if 'ylim' in spec:
+        ax.set_ylim(*spec['ylim'])
+    ax.bar_label(bars, fmt=spec['fmt'], padding=spec.get('label_padding', 0))
+    return bars
+
+
+def _chart(file_name, chart_label, prepare, palette=True):
+    """图表生成装饰器：统一处理输出路径、保存与异常日志
+
+    prepare(results) 从实验结果中提取绘图数据（元组），
+    被装饰函数只负责按这些数据绘图并返回 Figure。
+    """
+    def decorator(draw_func):
+        @functools.wraps(draw_func)
+        def wrapper(results, dpi=CHART_DPI):
+            try:
+                chart_data = prepare(results)
+
+                chart_path = os.path.join(RESULTS_PATH, file_name)
+                fig = draw_func(*chart_data)
+
+                # 保存图表
+                if palette:
+                    _save_palette_png(fig, chart_path, dpi=dpi)
+                else:
+                    fig.savefig(chart_path, dpi=dpi)
+                plt.close(fig)
+
+                logger.info(f"{chart_label} chart saved to: {chart_path}")
+                return chart_path
+
+            except Exception as e:
+                logger.error(f"Failed to create {chart_label.lower()} chart: {e}")
+                return None
+        return wrapper
+    return decorator
+
+
+def _performance_chart_data(comparison_results):
+    """提取性能对比图数据"""
+    system_metrics = [comparison_results[key] for key in _SYSTEM_RESULT_KEYS]
+    latencies = [metrics["avg_latency_ms"] for metrics in system_metrics]
+    throughputs = [metrics["avg_throughput_tps"] for metrics in system_metrics]
+    return latencies, throughputs
+
+
+@_chart("performance_comparison.png", "Performance comparison", _performance_chart_data)
+def visualize_performance_comparison(latencies, throughputs):
     """可视化性能对比结果"""
-    try:
-        # 创建性能对比图表
-        systems = ['DVSS-PPA', 'Hyperledger', 'Ethereum']
-        latencies = [
-            comparison_results["dvss_ppa_results"]["avg_latency_ms"],
-            comparison_results["hyperledger_simulation"]["avg_latency_ms"],
-            comparison_results["ethereum_simulation"]["avg_latency_ms"]
-        ]
-        throughputs = [
-            comparison_results["dvss_ppa_results"]["avg_throughput_tps"],
-            comparison_results["hyperledger_simulation"]["avg_throughput_tps"],
-            comparison_results["ethereum_simulation"]["avg_throughput_tps"]
-        ]
-
-        # 延迟对比图
-        plt.figure(figsize=(12, 5))
-
-        plt.subplot(1, 2, 1)
-        bars1 = plt.bar(systems, latencies, color=['#2E8B57', '#4682B4', '#CD853F'])
-        plt.title('Average Latency Comparison')
-        plt.ylabel('Latency (ms)')
-        plt.yscale('log')  # 使用对数刻度
-
-        # 添加数值标签
-        for bar, latency in zip(bars1, latencies):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height(),
-                     f'{latency:.1f}ms', ha='center', va='bottom')
-
-        # 吞吐量对比图
-        plt.subplot(1, 2, 2)
-        bars2 = plt.bar(systems, throughputs, color=['#2E8B57', '#4682B4', '#CD853F'])
-        plt.title('Average Throughput Comparison')
-        plt.ylabel('Throughput (TPS)')
-
-        # 添加数值标签
-        for bar, throughput in zip(bars2, throughputs):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height(),
-                     f'{throughput:.1f}', ha='center', va='bottom')
-
-        plt.tight_layout()
-
-        # 保存图表
-        chart_path = os.path.join(RESULTS_PATH, "performance_comparison.png")
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-
-        logger.info(f"Performance comparison chart saved to: {chart_path}")
-        return chart_path
-
-    except Exception as e:
-        logger.error(f"Failed to create performance comparison chart: {e}")
-        return None
-
-
-def visualize_privacy_scores(privacy_results):
-    """可视化隐私保护评分"""
-    try:
-        scores = privacy_results["privacy_scores"]
-        categories = ['Access Control', 'Secret Sharing', 'Zero Knowledge', 'Overall']
-        values = [
-            scores["access_control_score"],
-            scores["secret_sharing_score"],
-            scores["zero_knowledge_score"],
-            scores["overall_privacy_score"]
-        ]
-
-        plt.figure(figsize=(10, 6))
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
-        bars = plt.bar(categories, values, color=colors)
-
-        plt.title('Privacy Protection Scores')
-        plt.ylabel('Score (%)')
-        plt.ylim(0, 100)
-
-        # 添加数值标签
-        for bar, value in zip(bars, values):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 1,
-                     f'{value:.1f}%', ha='center', va='bottom')
-
-        # 添加及格线
-        plt.axhline(y=80, color='red', linestyle='--', alpha=0.7, label='Target (80%)')
-        plt.legend()
-
-        plt.tight_layout()
+    fig, (ax_lat, ax_thr) = plt.subplots(1, 2, figsize=(12, 5))
 
-        # 保存图表
-        chart_path = os.path.join(RESULTS_PATH, "privacy_scores.png")
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+    # 延迟对比图 / 吞吐量对比图
+    _draw_bar_chart(ax_lat, 'latency', latencies)
+    _draw_bar_chart(ax_thr, 'throughput', throughputs)
+    return fig
 
-        logger.info(f"Privacy scores chart saved to: {chart_path}")
-        return chart_path
 
-    except Exception as e:
-        logger.error(f"Failed to create privacy scores chart: {e}")
-        return None
+def _privacy_chart_data(privacy_results):
+    """提取隐私评分图数据"""
+    scores = privacy_results["privacy_scores"]
+    return ([scores[key] for key in _PRIVACY_SCORE_KEYS],)
 
 
-def visualize_throughput_scalability(throughput_results):
-    """可视化吞吐量可扩展性"""
-    try:
-        multi_thread_results = throughput_results["multi_thread_results"]
-
-        thread_counts = []
-        tps_values = []
+@_chart("privacy_scores.png", "Privacy scores", _privacy_chart_data)
+def visualize_privacy_scores(values):
+    """可视化隐私保护评分"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    _draw_bar_chart(ax, 'privacy', values)
 
-        for key, result in multi_thread_results.items():
-            thread_counts.append(result["thread_count"])
-            tps_values.append(result["transactions_per_second"])
+    # 添加及格线
+    ax.axhline(y=80, color='red', linestyle='--', alpha=0.7, label='Target (80%)')
+    ax.legend()
+    return fig
 
-        # 排序确保线性显示
-        sorted_data = sorted(zip(thread_counts, tps_values))
-        thread_counts, tps_values = zip(*sorted_data)
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(thread_counts, tps_values, 'o-', linewidth=2, markersize=8, color='#3498db')
+def _throughput_chart_data(throughput_results):
+    """提取吞吐量可扩展性图数据"""
+    multi_thread_results = throughput_results["multi_thread_results"]
 
-        # 理想线性扩展线
-        single_thread_tps = throughput_results["single_thread_results"]["transactions_per_second"]
-        ideal_tps = [single_thread_tps * tc for tc in thread_counts]
-        plt.plot(thread_counts, ideal_tps, '--', alpha=0.7, color='red', label='Ideal Linear Scaling')
+    # 排序确保线性显示
+    sorted_data = sorted((result["thread_count"], result["transactions_per_second"])
+                         for result in multi_thread_results.values())
+    single_thread_tps = throughput_results["single_thread_results"]["transactions_per_second"]
+    return sorted_data, single_thread_tps
 
-        plt.title('Throughput Scalability Analysis')
-        plt.xlabel('Number of Threads')
-        plt.ylabel('Throughput (TPS)')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
 
-        # 添加数值标签
-        for tc, tps in zip(thread_counts, tps_values):
-            plt.annotate(f'{tps:.1f}', (tc, tps), textcoords="offset points",
-                         xytext=(0, 10), ha='center')
+# 折线图含抗锯齿渐变色，保存为真彩色PNG
+@_chart("throughput_scalability.png", "Throughput scalability", _throughput_chart_data, palette=False)
+def visualize_throughput_scalability(sorted_data, single_thread_tps):
+    """可视化吞吐量可扩展性"""
+    thread_counts, tps_values = np.asarray(sorted_data, dtype=np.float64).T
 
-        plt.tight_layout()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(thread_counts, tps_values, 'o-', linewidth=2, markersize=8, color='#3498db')
 
-        # 保存图表
-        chart_path = os.path.join(RESULTS_PATH, "throughput_scalability.png")
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+    # 理想线性扩展线
+    ideal_tps = single_thread_tps * thread_counts
+    ax.plot(thread_counts, ideal_tps, '--', alpha=0.7, color='red', label='Ideal Linear Scaling')
 
-        logger.info(f"Throughput scalability chart saved to: {chart_path}")
-        return chart_path
+    ax.set_title('Throughput Scalability Analysis')
+    ax.set_xlabel('Number of Threads')
+    ax.set_ylabel('Throughput (TPS)')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
 
-    except Exception as e:
-        logger.error(f"Failed to create throughput scalability chart: {e}")
-        return None
+    # 添加数值标签
+    label_kw = {"textcoords": "offset points", "xytext": (0, 10), "ha": 'center'}
+    for tc, tps in sorted_data:
+        ax.annotate(f'{tps:.1f}', (tc, tps), **label_kw)
+    return fig
 
 
-def generate_all_visualizations(experiment_results):
+def generate_all_visualizations(experiment_results, dpi=CHART_DPI):
     """生成所有可视化图表"""
-    chart_paths = []
+    chart_jobs = []
 
     if 'comparison' in experiment_results:
-        chart_path = visualize_performance_comparison(experiment_results['comparison'])
-        if chart_path:
-            chart_paths.append(chart_path)
+        chart_jobs.append((visualize_performance_comparison, experiment_results['comparison']))
 
     if 'privacy' in experiment_results:
-        chart_path = visualize_privacy_scores(experiment_results['privacy'])
-        if chart_path:
-            chart_paths.append(chart_path)
+        chart_jobs.append((visualize_privacy_scores, experiment_results['privacy']))
 
     # 如果有吞吐量测试结果，添加可视化
     for key, results in experiment_results.items():
         if 'throughput' in key.lower() and 'multi_thread_results' in results:
-            chart_path = visualize_throughput_scalability(results)
-            if chart_path:
-                chart_paths.append(chart_path)
+            chart_jobs.append((visualize_throughput_scalability, results))
             break
 
+    if not chart_jobs:
+        logger.info("Generated 0 visualization charts")
+        return []
+
+    # 各图表互不依赖，分配到独立进程并行绘制
+    with ProcessPoolExecutor(max_workers=len(chart_jobs)) as executor:
+        futures = [executor.submit(chart_func, results, dpi)
+                   for chart_func, results in chart_jobs]
+        chart_paths = [future.result() for future in futures]
+
+    chart_paths = [chart_path for chart_path in chart_paths if chart_path]
+
     logger.info(f"Generated {len(chart_paths)} visualization charts")
-    return chart_paths
\ No newline at end of file
+    return chart_paths
@@ -7,34 +7,77 @@ Created: 2025-06-13 08:47:13
 Description: 区块链存储逻辑
 """
 
-import hashlib
-import json
 import time
+import json
+import orjson
 import logging
 from typing import Dict, List
+from config.settings import HASH_FN
 
 logger = logging.getLogger(__name__)
 
+# 区块/交易完整性哈希仅在系统内部使用，算法由settings固定配置（默认SHA-256）
+_new_block_hasher = HASH_FN
+
+
+def _serialize(obj) -> bytes:
+    """规范化序列化（键排序、紧凑分隔符），作为哈希输入"""
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # orjson不支持超过64位的整数（Shamir有限域为2^127-1），回退到标准库json
+        return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _update_with_blob(hasher, blob: bytes):
+    """以长度前缀方式写入哈希流，避免相邻数据拼接歧义"""
+    hasher.update(len(blob).to_bytes(4, "little"))
+    hasher.update(blob)
+
 
 class Block:
     """区块数据结构"""
 
-    def __init__(self, index: int, timestamp: float, data: dict, previous_hash: str):
+    __slots__ = ('index', 'timestamp', 'data', 'previous_hash', 'hash')
+
+    def __init__(self, index: int, timestamp: float, data: dict, previous_hash: str, data_hasher=None):
         self.index = index
         self.timestamp = timestamp
         self.data = data
         self.previous_hash = previous_hash
-        self.hash = self.calculate_hash()
+        # data_hasher: 入池时已增量写入交易数据的哈希对象，仅用于计算初始哈希，挖矿时无需重新序列化交易列表
+        if data_hasher is not None:
+            self.hash = self._finalize_hash(self._hash_other_fields(data_hasher.copy()))
+        else:
+            self.hash = self.calculate_hash()
 
     def calculate_hash(self) -> str:
-        """计算区块哈希"""
-        block_string = json.dumps({
+        """计算区块哈希（按当前区块数据重新计算）"""
+        return self._finalize_hash(self._hash_data())
+
+    def _hash_data(self):
+        """序列化区块数据并写入新的哈希对象"""
+        hasher = _new_block_hasher()
+        for transaction in self.data.get("transactions", ()):
+            _update_with_blob(hasher, _serialize(transaction))
+        return self._hash_other_fields(hasher)
+
+    def _hash_other_fields(self, hasher):
+        """写入交易列表以外的全部数据字段及交易数量，使整个data映射都受哈希保护"""
+        _update_with_blob(hasher, _serialize({
+            "fields": {key: value for key, value in self.data.items() if key != "transactions"},
+            "transaction_count": len(self.data["transactions"]) if "transactions" in self.data else None
+        }))
+        return hasher
+
+    def _finalize_hash(self, hasher) -> str:
+        """写入区块头字段并输出十六进制摘要"""
+        _update_with_blob(hasher, _serialize({
             "index": self.index,
             "timestamp": self.timestamp,
-            "data": self.data,
             "previous_hash": self.previous_hash
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        }))
+        return hasher.hexdigest()
 
 
 class BlockchainStorage:
@@ -43,6 +86,7 @@ class BlockchainStorage:
     def __init__(self):
         self.chain = []
         self.pending_transactions = []
+        self._pending_hasher = _new_block_hasher()
         self._create_genesis_block()
 
     def _create_genesis_block(self):
@@ -57,21 +101,35 @@ class BlockchainStorage:
 
     def add_transaction(self, transaction: dict):
         """添加交易到待处理池"""
+        # 入池时即完成序列化并增量更新哈希，挖矿时无需重新序列化整个区块
+        _update_with_blob(self._pending_hasher, _serialize(transaction))
         self.pending_transactions.append(transaction)
 
+    def add_transactions_bulk(self, transactions: List[dict]) -> int:
+        """批量添加交易到待处理池"""
+        # 先完成整批序列化再更新哈希与待处理池，序列化失败时两者都保持不变
+        blobs = [_serialize(transaction) for transaction in transactions]
+        hasher = self._pending_hasher
+        for blob in blobs:
+            _update_with_blob(hasher, blob)
+        self.pending_transactions.extend(transactions)
+        return len(transactions)
+
     def mine_pending_transactions(self) -> Block:
         """挖矿处理待处理交易"""
         block = Block(
             len(self.chain),
             time.time(),
             {"transactions": self.pending_transactions},
-            self.get_latest_block().hash
+            self.get_latest_block().hash,
+            data_hasher=self._pending_hasher
         )
 
         self.chain.append(block)
         self.pending_transactions = []
+        self._pending_hasher = _new_block_hasher()
 
-        logger.info(f"Block mined: {block.hash[:16]}...")
+        logger.info("Block mined: %.16s...", block.hash)
         return block
 
     def get_chain_info(self) -> dict:
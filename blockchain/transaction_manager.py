@@ -7,19 +7,45 @@ Created: 2025-06-13 08:47:13
 Description: 交易管理模块
 """
 
+import os
 import time
+import base64
 import hashlib
 import logging
-from utils.helpers import generate_id
+import itertools
+import threading
 
 logger = logging.getLogger(__name__)
 
+# 交易ID = 进程级随机前缀 + 单调递增计数器，避免毫秒时间戳ID在高并发下重复
+_TX_PREFIX = None
+_tx_counter = None
+
+
+def _reseed_tx_ids():
+    """重新生成进程级前缀并重置计数器（fork出的子进程不能沿用父进程的前缀和计数）"""
+    global _TX_PREFIX, _tx_counter
+    _TX_PREFIX = base64.b32encode(os.urandom(5)).decode()
+    _tx_counter = itertools.count()
+
+
+_reseed_tx_ids()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_tx_ids)
+
+
+def _next_tx_id() -> str:
+    """生成交易ID"""
+    return f"TX_{_TX_PREFIX}_{next(_tx_counter):012x}"
+
 
 class Transaction:
     """交易数据结构"""
 
+    __slots__ = ('tx_id', 'tx_type', 'from_address', 'to_address', 'data', 'timestamp')
+
     def __init__(self, tx_type: str, from_address: str, to_address: str, data: dict):
-        self.tx_id = generate_id("TX")
+        self.tx_id = _next_tx_id()
         self.tx_type = tx_type
         self.from_address = from_address
         self.to_address = to_address
@@ -34,47 +60,58 @@ class TransactionManager:
         self.blockchain = blockchain_storage
         self.transaction_pool = []
         self.total_transactions = 0
+        # 交易池锁：允许多个线程并发提交，锁内只做列表追加/交换
+        self._pool_lock = threading.Lock()
 
     def create_transaction(self, tx_type: str, from_address: str, to_address: str, data: dict) -> Transaction:
         """创建新交易"""
         transaction = Transaction(tx_type, from_address, to_address, data)
-        logger.debug(f"Transaction created: {transaction.tx_id}")
+        logger.debug("Transaction created: %s", transaction.tx_id)
         return transaction
 
     def submit_transaction(self, transaction: Transaction) -> bool:
         """提交交易到交易池"""
         try:
-            self.transaction_pool.append(transaction)
-            self.total_transactions += 1
-            logger.info(f"Transaction submitted: {transaction.tx_id}")
+            with self._pool_lock:
+                self.transaction_pool.append(transaction)
+                self.total_transactions += 1
+            logger.info("Transaction submitted: %s", transaction.tx_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to submit transaction: {e}")
+            logger.error("Failed to submit transaction: %s", e)
             return False
 
     def process_transactions(self) -> dict:
         """处理所有待处理交易"""
-        if not self.transaction_pool:
+        # 取出当前交易池后立即释放锁，打包上链期间新交易可继续提交
+        with self._pool_lock:
+            pending, self.transaction_pool = self.transaction_pool, []
+
+        if not pending:
             return {"processed": 0}
 
-        # 将交易添加到区块链
-        for tx in self.transaction_pool:
-            self.blockchain.add_transaction({
+        # 将交易批量添加到区块链（整批要么全部进入待处理池，要么全部不进入）
+        try:
+            self.blockchain.add_transactions_bulk([{
                 "tx_id": tx.tx_id,
                 "type": tx.tx_type,
                 "from": tx.from_address,
                 "to": tx.to_address,
                 "data": tx.data,
                 "timestamp": tx.timestamp
-            })
+            } for tx in pending])
+        except Exception:
+            # 区块链未接受该批交易时放回交易池头部（保持提交顺序），避免交易丢失
+            with self._pool_lock:
+                self.transaction_pool[:0] = pending
+            raise
 
-        processed_count = len(self.transaction_pool)
-        self.transaction_pool = []
+        processed_count = len(pending)
 
         # 挖矿
         self.blockchain.mine_pending_transactions()
 
-        logger.info(f"Processed {processed_count} transactions")
+        logger.info("Processed %d transactions", processed_count)
         return {"processed": processed_count}
 
     def get_stats(self) -> dict:
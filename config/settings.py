@@ -8,7 +8,22 @@ Description: 全局配置文件 - 增强版
 """
 
 import os
+import hashlib
 import logging
+from types import MappingProxyType
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# 数据库驱动在导入时加载一次（可选依赖），避免探测线程在导入锁上串行等待
+try:
+    import pymysql
+except ImportError:
+    pymysql = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # =============================================================================
 # 数据库配置
@@ -82,15 +97,38 @@ EXPERIMENT_PARAMS = {
 # 算法配置
 # =============================================================================
 
+# Shamir有限域参数（模块级整数常量，热点循环可直接绑定为局部变量）
+SHAMIR_PRIME = (1 << 127) - 1  # 梅森素数 2^127 - 1
+SHAMIR_K_MIN, SHAMIR_K_MAX = 2, 10
+
+
+# 内部哈希算法固定配置（默认SHA-256），不随运行机器的CPU特性变化，
+# 保证同一份数据在不同机器上得到相同的区块/Merkle哈希；切换算法需显式设置环境变量
+HASH_ALGORITHM = os.getenv("HASH_ALGORITHM", "sha256").lower()
+
+
+def _resolve_hash_fn(algorithm: str):
+    """按配置的算法名返回哈希构造函数"""
+    if algorithm == "sha256":
+        return hashlib.sha256
+    if algorithm == "blake3":
+        # 显式选择BLAKE3时依赖必须存在，不静默回退，避免哈希结果与配置不符
+        from blake3 import blake3
+        return blake3
+    raise ValueError(f"Unsupported HASH_ALGORITHM: {algorithm}")
+
+
+HASH_FN = _resolve_hash_fn(HASH_ALGORITHM)
+
 ALGORITHM_CONFIG = {
     "shamir": {
-        "prime_modulus": 2 ** 127 - 1,
-        "k_min": 2,
-        "k_max": 10,
+        "prime_modulus": SHAMIR_PRIME,
+        "k_min": SHAMIR_K_MIN,
+        "k_max": SHAMIR_K_MAX,
         "enable_time_based_shares": True
     },
     "merkle": {
-        "hash_algorithm": "sha256",
+        "hash_algorithm": HASH_ALGORITHM,  # 内部完整性校验，无需与外部链兼容
         "max_tree_depth": 20
     },
     "zk_proof": {
@@ -134,6 +172,10 @@ PERFORMANCE_CONFIG = {
     "enable_profiling": os.getenv("ENABLE_PROFILING", "false").lower() == "true"
 }
 
+# 吞吐量测试的并发线程数；MySQL连接池按其最大值确定容量，使每个测试线程都能独占一个连接
+THROUGHPUT_THREAD_COUNTS = (2, 4, 8, 16)
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", max(THROUGHPUT_THREAD_COUNTS)))
+
 
 # =============================================================================
 # 配置验证和初始化
@@ -183,6 +225,7 @@ def print_configuration_summary():
     print(f"🔢 算法参数:")
     print(f"   分片数量: {EXPERIMENT_PARAMS['shard_count']}")
     print(f"   阈值: {EXPERIMENT_PARAMS['threshold']}")
+    print(f"   哈希算法: {HASH_ALGORITHM}")
 
     print(f"🎯 性能目标:")
     print(f"   目标TPS: {EXPERIMENT_PARAMS['target_tps']}")
@@ -206,32 +249,34 @@ def get_alternative_mysql_config():
     return MYSQL_FALLBACK_CONFIG.copy()
 
 
+# 测试/最小配置相对 EXPERIMENT_PARAMS 的覆盖项（只读）
+_TEST_CONFIG_OVERRIDES = MappingProxyType({
+    "data_size": 50,
+    "user_count": 20,
+    "item_count": 30,
+    "target_tps": 100,
+    "test_iterations": 1
+})
+
+_MINIMAL_CONFIG_OVERRIDES = MappingProxyType({
+    "data_size": 10,
+    "user_count": 5,
+    "item_count": 10,
+    "target_tps": 50,
+    "test_iterations": 1,
+    "enable_mysql": False,  # 禁用MySQL
+    "enable_redis": False  # 禁用Redis
+})
+
+
 def create_test_config():
     """创建测试配置（降低数据量）"""
-    test_config = EXPERIMENT_PARAMS.copy()
-    test_config.update({
-        "data_size": 50,
-        "user_count": 20,
-        "item_count": 30,
-        "target_tps": 100,
-        "test_iterations": 1
-    })
-    return test_config
+    return {**EXPERIMENT_PARAMS, **_TEST_CONFIG_OVERRIDES}
 
 
 def create_minimal_config():
     """创建最小配置（快速测试）"""
-    minimal_config = EXPERIMENT_PARAMS.copy()
-    minimal_config.update({
-        "data_size": 10,
-        "user_count": 5,
-        "item_count": 10,
-        "target_tps": 50,
-        "test_iterations": 1,
-        "enable_mysql": False,  # 禁用MySQL
-        "enable_redis": False  # 禁用Redis
-    })
-    return minimal_config
+    return {**EXPERIMENT_PARAMS, **_MINIMAL_CONFIG_OVERRIDES}
 
 
 # =============================================================================
@@ -242,14 +287,22 @@ def detect_and_configure_environment():
     """检测环境并自动配置"""
     print("🔍 检测运行环境...")
 
-    # 检测MySQL
-    mysql_available = test_mysql_connection()
-    if not mysql_available:
+    # 并行探测MySQL与Redis，启动耗时取两者较大值而非之和
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        mysql_future = executor.submit(test_mysql_connection)
+        redis_future = executor.submit(test_redis_connection)
+        mysql_config = mysql_future.result()
+        redis_available = redis_future.result()
+
+    # 检测MySQL（探测全部结束后再写回全局配置，可能切换为备用配置）
+    mysql_available = mysql_config is not None
+    if mysql_available:
+        MYSQL_CONFIG.update(mysql_config)
+    else:
         print("⚠️ MySQL不可用，将使用降级模式")
         EXPERIMENT_PARAMS["enable_mysql"] = False
 
     # 检测Redis
-    redis_available = test_redis_connection()
     if not redis_available:
         print("⚠️ Redis不可用，将禁用缓存功能")
         EXPERIMENT_PARAMS["enable_redis"] = False
@@ -257,13 +310,19 @@ def detect_and_configure_environment():
     # 根据可用资源调整参数
     if not mysql_available and not redis_available:
         print("📉 降低实验规模以适应限制环境")
-        EXPERIMENT_PARAMS.update(create_test_config())
+        EXPERIMENT_PARAMS.update(_TEST_CONFIG_OVERRIDES)
+
 
+def test_mysql_connection() -> Optional[dict]:
+    """测试MySQL连接，返回连接成功的配置（均失败时返回None）
+
+    探测过程不修改全局 MYSQL_CONFIG，由调用方在探测结束后统一写回，
+    以便与其他探测并行执行。
+    """
+    if pymysql is None:
+        return None
 
-def test_mysql_connection():
-    """测试MySQL连接"""
     try:
-        import pymysql
         conn = pymysql.connect(
             host=MYSQL_CONFIG["host"],
             port=MYSQL_CONFIG["port"],
@@ -272,7 +331,7 @@ def test_mysql_connection():
             connect_timeout=5
         )
         conn.close()
-        return True
+        return dict(MYSQL_CONFIG)
     except:
         try:
             # 尝试备用配置
@@ -284,17 +343,17 @@ def test_mysql_connection():
                 connect_timeout=5
             )
             conn.close()
-            # 更新为备用配置
-            MYSQL_CONFIG.update(MYSQL_FALLBACK_CONFIG)
-            return True
+            return {**MYSQL_CONFIG, **MYSQL_FALLBACK_CONFIG}
         except:
-            return False
+            return None
 
 
 def test_redis_connection():
     """测试Redis连接"""
+    if redis is None:
+        return False
+
     try:
-        import redis
         r = redis.Redis(
             host=REDIS_CONFIG["host"],
             port=REDIS_CONFIG["port"],
@@ -8,10 +8,90 @@ Description: 商品数据生成器
 """
 
 import random
+import numpy as np
 from decimal import Decimal
 from datetime import datetime, timedelta
 
 
+# 类别相关的固定数据（模块级常量，导入时构建一次）
+_CATEGORIES = ("Electronics", "Books", "Clothing", "Home & Garden", "Sports", "Toys")
+_SUPPLIERS = tuple(f"SUPPLIER_{i:03d}" for i in range(1, 21))
+
+# 商品名称模板
+_PRODUCT_TEMPLATES = {
+    "Electronics": {
+        "names": ["Smartphone", "Laptop", "Tablet", "Headphones", "Camera", "Speaker", "Monitor", "Keyboard"],
+        "brands": ["TechMax", "DigitalPro", "SmartGear", "EliteDevice", "InnoTech"],
+        "models": ["Pro", "Max", "Plus", "Standard", "Elite", "Premium", "Basic", "Advanced"]
+    },
+    "Books": {
+        "names": ["Programming Guide", "Data Science Manual", "Security Handbook", "AI Textbook", "Blockchain Bible"],
+        "brands": ["TechPublish", "EduBooks", "LearnPress", "KnowledgeHouse"],
+        "models": ["2024 Edition", "Latest", "Revised", "Complete", "Essential"]
+    },
+    "Clothing": {
+        "names": ["Business Shirt", "Casual Jeans", "Sports Jacket", "Running Shoes", "Winter Coat"],
+        "brands": ["StyleMax", "ComfortWear", "FashionPlus", "ActiveGear"],
+        "models": ["Classic", "Modern", "Vintage", "Sport", "Casual"]
+    },
+    "Home & Garden": {
+        "names": ["Office Chair", "Dining Table", "Floor Lamp", "Garden Tool", "Storage Box"],
+        "brands": ["HomePro", "GardenMax", "ComfortHome", "LifeStyle"],
+        "models": ["Deluxe", "Standard", "Compact", "Large", "Premium"]
+    },
+    "Sports": {
+        "names": ["Tennis Racket", "Basketball", "Running Shoes", "Fitness Equipment", "Sports Watch"],
+        "brands": ["SportMax", "FitnessPro", "ActiveLife", "HealthGear"],
+        "models": ["Pro", "Amateur", "Professional", "Training", "Competition"]
+    },
+    "Toys": {
+        "names": ["Educational Puzzle", "Action Figure", "Board Game", "Building Blocks", "Remote Car"],
+        "brands": ["PlayMax", "KidsFun", "LearnToy", "FamilyGame"],
+        "models": ["Kids", "Family", "Educational", "Fun", "Creative"]
+    }
+}
+
+# 价格/重量/尺寸范围（根据类别调整）
+_PRICE_RANGES = {
+    "Electronics": (50.0, 2000.0),
+    "Books": (10.0, 100.0),
+    "Clothing": (20.0, 300.0),
+    "Home & Garden": (25.0, 800.0),
+    "Sports": (15.0, 500.0),
+    "Toys": (5.0, 150.0)
+}
+
+_WEIGHT_RANGES = {
+    "Electronics": (0.1, 5.0),
+    "Books": (0.2, 2.0),
+    "Clothing": (0.1, 2.0),
+    "Home & Garden": (0.5, 50.0),
+    "Sports": (0.1, 10.0),
+    "Toys": (0.05, 3.0)
+}
+
+_DIMENSION_RANGES = {
+    "Electronics": {"length": (5, 40), "width": (3, 30), "height": (1, 15)},
+    "Books": {"length": (15, 25), "width": (10, 20), "height": (1, 5)},
+    "Clothing": {"length": (30, 80), "width": (25, 60), "height": (2, 10)},
+    "Home & Garden": {"length": (20, 200), "width": (15, 150), "height": (5, 100)},
+    "Sports": {"length": (10, 150), "width": (8, 80), "height": (3, 50)},
+    "Toys": {"length": (5, 50), "width": (5, 40), "height": (2, 30)}
+}
+
+# 预编译的类别表：按 _CATEGORIES 下标索引，生成时只做数组取值
+_CATEGORY_TABLE = tuple(
+    (category, tuple(_PRODUCT_TEMPLATES[category]["names"]),
+     tuple(_PRODUCT_TEMPLATES[category]["brands"]), tuple(_PRODUCT_TEMPLATES[category]["models"]))
+    for category in _CATEGORIES
+)
+_SKU_PREFIXES = np.array([f"SKU_{c[:3].upper()}_" for c in _CATEGORIES])
+_PRICE_BOUNDS = np.array([_PRICE_RANGES[c] for c in _CATEGORIES])
+_WEIGHT_BOUNDS = np.array([_WEIGHT_RANGES[c] for c in _CATEGORIES])
+_DIMENSION_BOUNDS = np.array([[_DIMENSION_RANGES[c][d] for d in ("length", "width", "height")]
+                              for c in _CATEGORIES])
+
+
 class ItemGenerator:
     """商品数据生成器"""
 
@@ -19,119 +99,53 @@ class ItemGenerator:
     def generate_items(count: int) -> list:
         """生成商品数据"""
         items = []
-
-        categories = ["Electronics", "Books", "Clothing", "Home & Garden", "Sports", "Toys"]
-        privacy_levels = ["public", "internal", "confidential"]
-        suppliers = [f"SUPPLIER_{i:03d}" for i in range(1, 21)]
-
-        # 商品名称模板
-        product_templates = {
-            "Electronics": {
-                "names": ["Smartphone", "Laptop", "Tablet", "Headphones", "Camera", "Speaker", "Monitor", "Keyboard"],
-                "brands": ["TechMax", "DigitalPro", "SmartGear", "EliteDevice", "InnoTech"],
-                "models": ["Pro", "Max", "Plus", "Standard", "Elite", "Premium", "Basic", "Advanced"]
-            },
-            "Books": {
-                "names": ["Programming Guide", "Data Science Manual", "Security Handbook", "AI Textbook", "Blockchain Bible"],
-                "brands": ["TechPublish", "EduBooks", "LearnPress", "KnowledgeHouse"],
-                "models": ["2024 Edition", "Latest", "Revised", "Complete", "Essential"]
-            },
-            "Clothing": {
-                "names": ["Business Shirt", "Casual Jeans", "Sports Jacket", "Running Shoes", "Winter Coat"],
-                "brands": ["StyleMax", "ComfortWear", "FashionPlus", "ActiveGear"],
-                "models": ["Classic", "Modern", "Vintage", "Sport", "Casual"]
-            },
-            "Home & Garden": {
-                "names": ["Office Chair", "Dining Table", "Floor Lamp", "Garden Tool", "Storage Box"],
-                "brands": ["HomePro", "GardenMax", "ComfortHome", "LifeStyle"],
-                "models": ["Deluxe", "Standard", "Compact", "Large", "Premium"]
-            },
-            "Sports": {
-                "names": ["Tennis Racket", "Basketball", "Running Shoes", "Fitness Equipment", "Sports Watch"],
-                "brands": ["SportMax", "FitnessPro", "ActiveLife", "HealthGear"],
-                "models": ["Pro", "Amateur", "Professional", "Training", "Competition"]
-            },
-            "Toys": {
-                "names": ["Educational Puzzle", "Action Figure", "Board Game", "Building Blocks", "Remote Car"],
-                "brands": ["PlayMax", "KidsFun", "LearnToy", "FamilyGame"],
-                "models": ["Kids", "Family", "Educational", "Fun", "Creative"]
-            }
-        }
-
-        for i in range(count):
-            category = random.choice(categories)
-            template = product_templates[category]
-
-            base_name = random.choice(template["names"])
-            brand = random.choice(template["brands"])
-            model = random.choice(template["models"])
-
-            # 生成价格（根据类别调整价格范围）
-            price_ranges = {
-                "Electronics": (50.0, 2000.0),
-                "Books": (10.0, 100.0),
-                "Clothing": (20.0, 300.0),
-                "Home & Garden": (25.0, 800.0),
-                "Sports": (15.0, 500.0),
-                "Toys": (5.0, 150.0)
-            }
-
-            min_price, max_price = price_ranges[category]
-            price = round(random.uniform(min_price, max_price), 2)
-            cost = round(price * random.uniform(0.6, 0.8), 2)
-
-            # 生成重量（根据类别调整）
-            weight_ranges = {
-                "Electronics": (0.1, 5.0),
-                "Books": (0.2, 2.0),
-                "Clothing": (0.1, 2.0),
-                "Home & Garden": (0.5, 50.0),
-                "Sports": (0.1, 10.0),
-                "Toys": (0.05, 3.0)
-            }
-
-            min_weight, max_weight = weight_ranges[category]
-            weight = round(random.uniform(min_weight, max_weight), 2)
+        if count <= 0:
+            return items
+
+        # 所有随机字段在NumPy中一次性批量生成，循环内只做取值与字典组装
+        rng = np.random.default_rng()
+        category_idx = rng.integers(0, len(_CATEGORIES), count)
+        prices = np.round(rng.uniform(_PRICE_BOUNDS[category_idx, 0], _PRICE_BOUNDS[category_idx, 1]), 2)
+        costs = np.round(prices * rng.uniform(0.6, 0.8, count), 2)
+        weights = np.round(rng.uniform(_WEIGHT_BOUNDS[category_idx, 0], _WEIGHT_BOUNDS[category_idx, 1]), 2)
+        dimensions = rng.integers(_DIMENSION_BOUNDS[category_idx, :, 0],
+                                  _DIMENSION_BOUNDS[category_idx, :, 1], endpoint=True)
+        quantities = rng.integers(10, 1001, count)
+        supplier_idx = rng.integers(0, len(_SUPPLIERS), count)
+        age_days = rng.integers(1, 731, count)  # 最近2年内创建
+        name_picks = rng.random((count, 3))
+        skus = np.char.add(_SKU_PREFIXES[category_idx],
+                           np.char.zfill(np.arange(1, count + 1).astype(str), 5))
+        now = datetime.now()
+
+        for sku, cat, price, cost, weight, (length, width, height), quantity, supplier, age, picks in zip(
+                skus.tolist(), category_idx.tolist(), prices.tolist(), costs.tolist(),
+                weights.tolist(), dimensions.tolist(), quantities.tolist(), supplier_idx.tolist(), age_days.tolist(), name_picks.tolist()):
+            category, names, brands, models = _CATEGORY_TABLE[cat]
+
+            base_name = names[int(picks[0] * len(names))]
+            brand = brands[int(picks[1] * len(brands))]
+            model = models[int(picks[2] * len(models))]
 
             item = {
-                "sku": f"SKU_{category[:3].upper()}_{i + 1:05d}",
+                "sku": sku,
                 "name": f"{brand} {base_name} {model}",
                 "category": category,
-                "quantity": random.randint(10, 1000),
+                "quantity": quantity,
                 "price": price,
                 "cost": cost,
                 "weight": weight,
-                "dimensions": ItemGenerator._generate_dimensions(category),
+                "dimensions": {"length": length, "width": width, "height": height},
                 "description": ItemGenerator._generate_description(brand, base_name, model, category),
-                "supplier_id": random.choice(suppliers),
+                "supplier_id": _SUPPLIERS[supplier],
                 "privacy_level": ItemGenerator._determine_privacy_level(category, price),
                 "requires_zk_proof": ItemGenerator._requires_zk_proof(category, price),
-                "created_at": datetime.now() - timedelta(days=random.randint(1, 730))  # 最近2年内创建
+                "created_at": now - timedelta(days=age)
             }
             items.append(item)
 
         return items
 
-    @staticmethod
-    def _generate_dimensions(category: str) -> dict:
-        """根据类别生成合理的尺寸"""
-        dimension_ranges = {
-            "Electronics": {"length": (5, 40), "width": (3, 30), "height": (1, 15)},
-            "Books": {"length": (15, 25), "width": (10, 20), "height": (1, 5)},
-            "Clothing": {"length": (30, 80), "width": (25, 60), "height": (2, 10)},
-            "Home & Garden": {"length": (20, 200), "width": (15, 150), "height": (5, 100)},
-            "Sports": {"length": (10, 150), "width": (8, 80), "height": (3, 50)},
-            "Toys": {"length": (5, 50), "width": (5, 40), "height": (2, 30)}
-        }
-
-        ranges = dimension_ranges.get(category, {"length": (10, 50), "width": (8, 40), "height": (2, 20)})
-
-        return {
-            "length": random.randint(*ranges["length"]),
-            "width": random.randint(*ranges["width"]),
-            "height": random.randint(*ranges["height"])
-        }
-
     @staticmethod
     def _generate_description(brand: str, base_name: str, model: str, category: str) -> str:
         """生成商品描述"""
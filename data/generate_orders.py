@@ -7,10 +7,13 @@ Created: 2025-06-13 08:47:13
 Description: 模拟订单生成
 """
 
-import random
+import os
 import json
+import numpy as np
 from datetime import datetime, timedelta
-from utils.helpers import generate_id
+
+ORDER_STATUSES = ["pending", "confirmed", "shipped", "delivered"]
+PAYMENT_STATUSES = ["pending", "paid"]
 
 
 class OrderGenerator:
@@ -19,34 +22,58 @@ class OrderGenerator:
     @staticmethod
     def generate_orders(count: int) -> list:
         """生成订单数据"""
-        orders = []
-
-        for i in range(count):
-            order = {
-                "order_id": generate_id("ORDER"),
-                "customer_id": f"CUST_{random.randint(1000, 9999)}",
-                "merchant_id": f"MERCH_{random.randint(100, 999)}",
-                "logistics_id": f"LOG_{random.randint(100, 999)}",
+        # 按列批量生成随机字段（NumPy在C层完成），组装阶段只做一次zip遍历
+        rng = np.random.default_rng()
+        # 订单ID：一次os.urandom读取全部随机字节后按16字节切片转十六进制，避免逐单系统调用及毫秒时间戳ID重复
+        raw = os.urandom(16 * count)
+        order_ids = ["ORDER_" + raw[i:i + 16].hex() for i in range(0, 16 * count, 16)]
+        customer_ids = np.char.add("CUST_", rng.integers(1000, 10000, count).astype(str)).tolist()
+        merchant_ids = np.char.add("MERCH_", rng.integers(100, 1000, count).astype(str)).tolist()
+        logistics_ids = np.char.add("LOG_", rng.integers(100, 1000, count).astype(str)).tolist()
+        item_skus = np.char.add("ITEM_", rng.integers(1000, 10000, count).astype(str)).tolist()
+        item_quantities = rng.integers(1, 6, count).tolist()
+        item_prices = np.round(rng.uniform(10, 100, count), 2).tolist()
+        total_amounts = np.round(rng.uniform(50, 500, count), 2).tolist()
+        order_statuses = rng.choice(ORDER_STATUSES, count).tolist()
+        payment_statuses = rng.choice(PAYMENT_STATUSES, count).tolist()
+        age_days = rng.integers(0, 31, count).tolist()
+        thresholds = rng.integers(2, 5, count).tolist()
+        share_counts = rng.integers(3, 7, count).tolist()
+
+        # 创建时间只有31种取值，预先算好后按天数下标取用
+        now = datetime.now()
+        created_dates = [now - timedelta(days=days) for days in range(31)]
+
+        orders = [
+            {
+                "order_id": order_id,
+                "customer_id": customer_id,
+                "merchant_id": merchant_id,
+                "logistics_id": logistics_id,
                 "order_items": [
                     {
-                        "sku": f"ITEM_{random.randint(1000, 9999)}",
-                        "quantity": random.randint(1, 5),
-                        "price": round(random.uniform(10, 100), 2)
+                        "sku": sku,
+                        "quantity": quantity,
+                        "price": price
                     }
                 ],
-                "total_amount": round(random.uniform(50, 500), 2),
-                "order_status": random.choice(["pending", "confirmed", "shipped", "delivered"]),
-                "payment_status": random.choice(["pending", "paid"]),
-                "created_at": datetime.now() - timedelta(days=random.randint(0, 30)),
+                "total_amount": total_amount,
+                "order_status": order_status,
+                "payment_status": payment_status,
+                "created_at": created_dates[age],
                 "privacy_requirements": {
                     "merchant_access": ["items", "amount"],
                     "logistics_access": ["address"],
                     "customer_access": ["status"]
                 },
                 "requires_secret_sharing": True,
-                "shamir_threshold": random.randint(2, 4),
-                "shamir_shares": random.randint(3, 6)
+                "shamir_threshold": threshold,
+                "shamir_shares": shares
             }
-            orders.append(order)
+            for (order_id, customer_id, merchant_id, logistics_id, sku, quantity, price, total_amount,
+                 order_status, payment_status, age, threshold, shares) in zip(
+                order_ids, customer_ids, merchant_ids, logistics_ids, item_skus, item_quantities, item_prices,
+                total_amounts, order_statuses, payment_statuses, age_days, thresholds, share_counts)
+        ]
 
         return orders
\ No newline at end of file
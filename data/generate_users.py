@@ -8,19 +8,72 @@ Description: 用户数据生成器
 """
 
 import random
+import numpy as np
 from datetime import datetime, timedelta
 from utils.helpers import generate_id
 
 
+# 用户生成固定数据（模块级常量，避免每个用户重复构建列表）
+_ROLES = ("merchant", "logistics", "customer", "admin")
+_ORGANIZATIONS = ("TechCorp", "LogiFlow", "RetailMax", "AdminSys", "DataSecure", "SmartChain", "CryptoLogic")
+_EMAIL_DOMAINS = ("dvss.com", "blockchain.org", "privacy.net")
+_PRIVILEGED_ROLES = frozenset({"admin", "merchant"})
+_LAST_LOGIN_BUCKET_P = (0.7, 0.2, 0.1)
+
+# 各角色权限字典：同角色用户共享同一实例（约定只读，不再为每个用户复制字典）
+_ROLE_PERMISSIONS = {
+    "merchant": {
+        "read": True,
+        "write": True,
+        "delete": False,
+        "admin": False,
+        "access_orders": True,
+        "access_products": True,
+        "access_customers": False
+    },
+    "logistics": {
+        "read": True,
+        "write": True,
+        "delete": False,
+        "admin": False,
+        "access_orders": True,
+        "access_shipping": True,
+        "access_tracking": True
+    },
+    "customer": {
+        "read": True,
+        "write": False,
+        "delete": False,
+        "admin": False,
+        "access_own_orders": True,
+        "access_public_info": True
+    },
+    "admin": {
+        "read": True,
+        "write": True,
+        "delete": True,
+        "admin": True,
+        "access_all": True,
+        "manage_users": True,
+        "system_config": True
+    }
+}
+
+_ACCESS_LEVELS = {
+    "admin": "premium",
+    "merchant": "standard",
+    "logistics": "standard",
+    "customer": "basic"
+}
+
+
 class UserGenerator:
     """用户数据生成器"""
 
     @staticmethod
     def generate_users(count: int) -> list:
         """生成用户数据"""
-        users = []
-        roles = ["merchant", "logistics", "customer", "admin"]
-        organizations = ["TechCorp", "LogiFlow", "RetailMax", "AdminSys", "DataSecure", "SmartChain", "CryptoLogic"]
+        now = datetime.now()
 
         # 确保每种角色都有足够的用户
         role_distribution = {
@@ -30,126 +83,56 @@ class UserGenerator:
             "admin": max(1, count // 10)
         }
 
-        user_index = 1
-
-        # 按角色分配生成用户
+        # 先确定每个用户的角色：按角色分配，不足部分随机补齐
+        user_roles = []
         for role, role_count in role_distribution.items():
-            for i in range(role_count):
-                if user_index > count:
-                    break
-
-                user = {
-                    "user_id": f"USER_{user_index:04d}",
-                    "username": f"{role}_{user_index:03d}",
-                    "email": f"{role}{user_index}@{random.choice(['dvss.com', 'blockchain.org', 'privacy.net'])}",
-                    "role": role,
-                    "organization": random.choice(organizations),
-                    "permissions": UserGenerator._generate_permissions(role),
-                    "privacy_preferences": {
-                        "data_sharing": random.choice([True, False]),
-                        "analytics": role in ["admin", "merchant"],
-                        "notifications": True,
-                        "encryption_required": role in ["admin", "merchant"]
-                    },
-                    "zk_public_key": f"zk_key_{role}_{user_index}_{random.randint(1000, 9999)}",
-                    "access_level": UserGenerator._get_access_level(role),
-                    "last_login": UserGenerator._generate_last_login(),
-                    "created_at": datetime.now() - timedelta(days=random.randint(1, 365))
-                }
-                users.append(user)
-                user_index += 1
-
-        # 如果还需要更多用户，随机生成剩余的
-        while len(users) < count:
-            role = random.choice(roles)
-            user = {
-                "user_id": f"USER_{user_index:04d}",
-                "username": f"{role}_{user_index:03d}",
-                "email": f"{role}{user_index}@{random.choice(['dvss.com', 'blockchain.org', 'privacy.net'])}",
-                "role": role,
-                "organization": random.choice(organizations),
-                "permissions": UserGenerator._generate_permissions(role),
-                "privacy_preferences": {
-                    "data_sharing": random.choice([True, False]),
-                    "analytics": role in ["admin", "merchant"],
-                    "notifications": True,
-                    "encryption_required": role in ["admin", "merchant"]
-                },
-                "zk_public_key": f"zk_key_{role}_{user_index}_{random.randint(1000, 9999)}",
-                "access_level": UserGenerator._get_access_level(role),
-                "last_login": UserGenerator._generate_last_login(),
-                "created_at": datetime.now() - timedelta(days=random.randint(1, 365))
-            }
-            users.append(user)
-            user_index += 1
+            user_roles.extend([role] * min(role_count, count - len(user_roles)))
+        while len(user_roles) < count:
+            user_roles.append(random.choice(_ROLES))
+
+        # 最后登录时间：70%在最近7天内，20%在最近30天内，10%很久没登录（整批一次生成）
+        rng = np.random.default_rng()
+        buckets = rng.choice(3, size=count, p=_LAST_LOGIN_BUCKET_P)
+        login_days = np.where(buckets == 0, rng.integers(0, 8, count),
+                              np.where(buckets == 1, rng.integers(8, 31, count), rng.integers(31, 181, count)))
+
+        users = [UserGenerator._build_user(user_index, role, now, now - timedelta(days=days))
+                 for user_index, (role, days) in enumerate(zip(user_roles, login_days.tolist()), start=1)]
 
         return users
 
     @staticmethod
-    def _generate_permissions(role: str) -> dict:
-        """根据角色生成权限"""
-        base_permissions = {
-            "merchant": {
-                "read": True,
-                "write": True,
-                "delete": False,
-                "admin": False,
-                "access_orders": True,
-                "access_products": True,
-                "access_customers": False
-            },
-            "logistics": {
-                "read": True,
-                "write": True,
-                "delete": False,
-                "admin": False,
-                "access_orders": True,
-                "access_shipping": True,
-                "access_tracking": True
+    def _build_user(user_index: int, role: str, now: datetime, last_login: datetime) -> dict:
+        """构建单个用户数据"""
+        privileged = role in _PRIVILEGED_ROLES
+        return {
+            "user_id": f"USER_{user_index:04d}",
+            "username": f"{role}_{user_index:03d}",
+            "email": f"{role}{user_index}@{random.choice(_EMAIL_DOMAINS)}",
+            "role": role,
+            "organization": random.choice(_ORGANIZATIONS),
+            "permissions": UserGenerator._generate_permissions(role),
+            "privacy_preferences": {
+                "data_sharing": random.choice([True, False]),
+                "analytics": privileged,
+                "notifications": True,
+                "encryption_required": privileged
             },
-            "customer": {
-                "read": True,
-                "write": False,
-                "delete": False,
-                "admin": False,
-                "access_own_orders": True,
-                "access_public_info": True
-            },
-            "admin": {
-                "read": True,
-                "write": True,
-                "delete": True,
-                "admin": True,
-                "access_all": True,
-                "manage_users": True,
-                "system_config": True
-            }
+            "zk_public_key": f"zk_key_{role}_{user_index}_{random.randint(1000, 9999)}",
+            "access_level": UserGenerator._get_access_level(role),
+            "last_login": last_login,
+            "created_at": now - timedelta(days=random.randint(1, 365))
         }
-        return base_permissions.get(role, base_permissions["customer"])
 
     @staticmethod
-    def _get_access_level(role: str) -> str:
-        """根据角色获取访问级别"""
-        levels = {
-            "admin": "premium",
-            "merchant": "standard",
-            "logistics": "standard",
-            "customer": "basic"
-        }
-        return levels.get(role, "basic")
+    def _generate_permissions(role: str) -> dict:
+        """根据角色生成权限（同角色共享的普通字典，调用方不应修改）"""
+        return _ROLE_PERMISSIONS.get(role, _ROLE_PERMISSIONS["customer"])
 
     @staticmethod
-    def _generate_last_login():
-        """生成最后登录时间"""
-        # 70%的用户在最近7天内登录过
-        if random.random() < 0.7:
-            return datetime.now() - timedelta(days=random.randint(0, 7))
-        # 20%的用户在最近30天内登录过
-        elif random.random() < 0.9:
-            return datetime.now() - timedelta(days=random.randint(8, 30))
-        # 10%的用户很久没登录
-        else:
-            return datetime.now() - timedelta(days=random.randint(31, 180))
+    def _get_access_level(role: str) -> str:
+        """根据角色获取访问级别"""
+        return _ACCESS_LEVELS.get(role, "basic")
 
 
 def main():
@@ -18,29 +18,15 @@ class OrderPreprocessor:
         self.validator = DataValidator()
 
     def preprocess_orders(self, orders: list) -> list:
-        """预处理订单数据"""
-        processed_orders = []
-
-        for order in orders:
-            # 验证数据
-            is_valid, errors = self.validator.validate_order(order)
-
-            if is_valid:
-                # 标准化数据格式
-                processed_order = self._normalize_order(order)
-                processed_orders.append(processed_order)
-
-        return processed_orders
+        """预处理订单数据（验证与标准化合并为单次遍历，丢弃无效订单）"""
+        validate = self.validator.validate_and_normalize
+        return [self._normalize_order(order) for order in orders if validate(order) is not None]
 
     def _normalize_order(self, order: dict) -> dict:
-        """标准化订单格式"""
+        """标准化订单格式（金额已由验证器格式化）"""
         # 确保必要字段存在
         order.setdefault('currency', 'USD')
         order.setdefault('order_status', 'pending')
         order.setdefault('payment_status', 'pending')
 
-        # 格式化金额
-        if 'total_amount' in order:
-            order['total_amount'] = round(float(order['total_amount']), 2)
-
-        return order
\ No newline at end of file
+        return order
@@ -9,10 +9,13 @@ Description: 模拟攻击实验
 
 import random
 import logging
-from utils.helpers import generate_id
+from utils.helpers import generate_id, derive_secret
 
 logger = logging.getLogger(__name__)
 
+# 数据推理攻击检查的敏感字段
+_SENSITIVE_FIELDS = frozenset({"customer_address", "payment_details", "customer_phone"})
+
 
 def run_attack_simulation(orders, storage_modules, algorithm_modules):
     """运行攻击模拟实验"""
@@ -27,7 +30,7 @@ def run_attack_simulation(orders, storage_modules, algorithm_modules):
 
     # 阈值攻击模拟
     for order in orders[:10]:
-        secret = hash(order["order_id"]) % 1000000
+        secret = derive_secret(order["order_id"])
         shares, _, k = algorithm_modules['shamir'].share_secret(secret, 5, 0.7, 0.3, 0.5)
 
         # 模拟攻击者获得不足阈值的分片
@@ -71,15 +74,15 @@ def run_attack_simulation(orders, storage_modules, algorithm_modules):
         filtered_merchant = algorithm_modules['access_control'].filter_data_fields(order, "merchant")
         filtered_logistics = algorithm_modules['access_control'].filter_data_fields(order, "logistics")
 
-        # 检查是否有数据泄露
-        merchant_fields = set(filtered_merchant.keys())
-        logistics_fields = set(filtered_logistics.keys())
-        overlap = merchant_fields.intersection(logistics_fields)
+        # 检查是否有数据泄露（dict键视图直接支持集合运算）
+        merchant_fields = filtered_merchant.keys()
+        logistics_fields = filtered_logistics.keys()
+        overlap = merchant_fields & logistics_fields
 
-        # 检查敏感字段是否被保护
-        sensitive_fields = ["customer_address", "payment_details", "customer_phone"]
-        leaked_sensitive = any(field in filtered_merchant or field in filtered_logistics
-                               for field in sensitive_fields if field in order)
+        # 检查敏感字段是否被保护：订单不含敏感字段时（常见情况）直接短路
+        present_sensitive = _SENSITIVE_FIELDS.intersection(order)
+        leaked_sensitive = bool(present_sensitive) and not (
+            present_sensitive.isdisjoint(merchant_fields) and present_sensitive.isdisjoint(logistics_fields))
 
         results["data_inference_attacks"].append({
             "order_id": order["order_id"],
@@ -9,7 +9,7 @@ Description: 性能测试
 
 import time
 import logging
-from utils.helpers import calculate_metrics, generate_id
+from utils.helpers import generate_id, derive_secret
 
 logger = logging.getLogger(__name__)
 
@@ -24,44 +24,41 @@ def run_performance_test(orders, storage_modules, algorithm_modules):
         "overall_metrics": {}
     }
 
-    # 测试Shamir算法性能
-    shamir_times = []
-    for i, order in enumerate(orders[:100]):
-        start_time = time.time()
+    # 测试Shamir算法性能（整批分片/重构，Vandermonde矩阵与Lagrange系数只计算一次）
+    test_orders = orders[:100]
+    shamir = algorithm_modules['shamir']
+    start_ns = time.perf_counter_ns()
 
-        secret = hash(order["order_id"]) % 1000000
-        shares, _, k = algorithm_modules['shamir'].share_secret(
-            secret, 5, 0.7, 0.3, 0.5
-        )
-        recovered = algorithm_modules['shamir'].reconstruct_secret(shares[:k])
+    secrets = [derive_secret(order["order_id"]) for order in test_orders]
+    batch_shares, k = shamir.share_secrets_batch(secrets, 5, 0.7, 0.3, 0.5)
+    recovered = shamir.reconstruct_secrets_batch([shares[:k] for shares in batch_shares])
 
-        operation_time = time.time() - start_time
-        shamir_times.append(operation_time * 1000)  # 转换为毫秒
+    shamir_total_ms = (time.perf_counter_ns() - start_ns) / 1e6  # 转换为毫秒
 
-    results["algorithm_performance"]["shamir"] = calculate_metrics(shamir_times)
+    # 整批只有一次计时，只报告批次总耗时与折算的单次均值，不构造逐次延迟分布
+    results["algorithm_performance"]["shamir"] = _batch_metrics(shamir_total_ms, len(test_orders))
 
-    # 测试存储性能
-    storage_times = []
-    for order in orders[:50]:
-        start_time = time.time()
-        storage_modules['mysql'].save_order(order)
-        operation_time = time.time() - start_time
-        storage_times.append(operation_time * 1000)
+    # 测试存储性能（executemany批量写入，一次事务提交，报告批次总耗时与单次均值）
+    storage_orders = orders[:50]
+    start_ns = time.perf_counter_ns()
+    storage_modules['mysql'].save_order_batch(storage_orders)
+    storage_total_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-    results["storage_performance"]["mysql"] = calculate_metrics(storage_times)
+    results["storage_performance"]["mysql"] = _batch_metrics(storage_total_ms, len(storage_orders))
 
     # 整体性能指标
+    total_time_ms = shamir_total_ms + storage_total_ms
     results["overall_metrics"] = {
         "total_orders_processed": len(orders),
-        "avg_processing_time": sum(shamir_times + storage_times) / (len(shamir_times) + len(storage_times)),
-        "throughput_tps": len(orders) / sum(shamir_times + storage_times) * 1000
+        "avg_processing_time": total_time_ms / (len(test_orders) + len(storage_orders)),
+        "throughput_tps": len(orders) / total_time_ms * 1000
     }
 
     # 保存结果
     experiment_result = {
         "experiment_id": generate_id("PERF"),
         "algorithm_name": "Performance_Test",
-        "execution_time": sum(shamir_times + storage_times),
+        "execution_time": total_time_ms,
         "throughput": results["overall_metrics"]["throughput_tps"],
         "results": results
     }
@@ -69,4 +66,13 @@ def run_performance_test(orders, storage_modules, algorithm_modules):
     storage_modules['mysql'].save_experiment_result(experiment_result)
 
     logger.info("Performance test completed")
-    return results
\ No newline at end of file
+    return results
+
+
+def _batch_metrics(batch_total_ms, count):
+    """批量操作的计时指标：批次总耗时与折算的单次平均耗时"""
+    return {
+        "batch_total_ms": batch_total_ms,
+        "mean_per_op_ms": batch_total_ms / count if count else 0,
+        "count": count
+    }
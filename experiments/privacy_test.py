@@ -8,7 +8,7 @@ Description: 隐私保护实验
 """
 
 import logging
-from utils.helpers import generate_id
+from utils.helpers import generate_id, derive_secret
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,11 @@ def run_privacy_test(orders, storage_modules, algorithm_modules):
 
     roles = ["merchant", "logistics", "payment", "admin"]
 
+    # 评分所需的计数在各测试循环中顺带累加，避免事后再次遍历结果列表
+    granted_count = 0
+    sharing_match_count = 0
+    zk_valid_count = 0
+
     # 访问控制测试
     for i, order in enumerate(orders[:20]):
         role = roles[i % len(roles)]
@@ -37,6 +42,7 @@ def run_privacy_test(orders, storage_modules, algorithm_modules):
 
         # 测试数据过滤
         filtered_data = algorithm_modules['access_control'].filter_data_fields(order, role)
+        granted_count += access_result.granted
 
         results["access_control_tests"].append({
             "order_id": order["order_id"],
@@ -48,7 +54,7 @@ def run_privacy_test(orders, storage_modules, algorithm_modules):
 
     # 秘密共享测试
     for order in orders[:15]:
-        secret = hash(order["order_id"]) % 1000000
+        secret = derive_secret(order["order_id"])
         shares, _, k = algorithm_modules['shamir'].share_secret(
             secret, 5, 0.8, 0.2, 0.4
         )
@@ -58,6 +64,7 @@ def run_privacy_test(orders, storage_modules, algorithm_modules):
             if test_shares <= len(shares):
                 recovered = algorithm_modules['shamir'].reconstruct_secret(shares[:test_shares])
                 success = (recovered == secret) if test_shares >= k else (recovered != secret)
+                sharing_match_count += success == (test_shares >= k)
 
                 results["secret_sharing_tests"].append({
                     "order_id": order["order_id"],
@@ -79,6 +86,7 @@ def run_privacy_test(orders, storage_modules, algorithm_modules):
 
         # 验证证明
         is_valid = algorithm_modules['zk_proof'].verify_proof(proof, role)
+        zk_valid_count += is_valid
 
         results["zero_knowledge_tests"].append({
             "order_id": order["order_id"],
@@ -88,9 +96,9 @@ def run_privacy_test(orders, storage_modules, algorithm_modules):
         })
 
     # 计算隐私保护评分
-    access_success_rate = sum(1 for test in results["access_control_tests"] if test["access_granted"]) / len(results["access_control_tests"])
-    sharing_success_rate = sum(1 for test in results["secret_sharing_tests"] if test["reconstruction_success"] == test["expected_success"]) / len(results["secret_sharing_tests"])
-    zk_success_rate = sum(1 for test in results["zero_knowledge_tests"] if test["proof_valid"]) / len(results["zero_knowledge_tests"])
+    access_success_rate = granted_count / len(results["access_control_tests"])
+    sharing_success_rate = sharing_match_count / len(results["secret_sharing_tests"])
+    zk_success_rate = zk_valid_count / len(results["zero_knowledge_tests"])
 
     results["privacy_scores"] = {
         "access_control_score": access_success_rate * 100,
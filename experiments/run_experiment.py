@@ -7,11 +7,13 @@ Created: 2025-06-13 08:34:56
 Description: DVSS-PPA综合实验执行器 - main.py的核心依赖
 """
 
-import json
+import orjson
 import time
 import os
 from typing import Dict, List, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from utils.helpers import derive_secret
 
 try:
     from config.settings import EXPERIMENT_PARAMS, RESULTS_CONFIG
@@ -70,13 +72,20 @@ class DVSSExperimentRunner:
                 EXPERIMENT_PARAMS.get("data_size", 200)
             )
 
-            # 运行各项实验
-            experiment_results = {}
+            # 按列提取各阶段共用的订单字段，只遍历订单一次
+            columns = self._order_columns(orders)
 
-            experiment_results["shamir"] = self.run_shamir_experiment(orders)
-            experiment_results["merkle"] = self.run_merkle_experiment(orders)
-            experiment_results["zkp"] = self.run_zkp_experiment(orders)
-            experiment_results["access_control"] = self.run_access_control_experiment(orders)
+            # 运行各项实验：ZKP阶段的耗时来自模拟延迟（sleep），放到后台线程与其余阶段重叠；
+            # Shamir/Merkle/访问控制为CPU密集型，依次执行，避免相互争用GIL影响各自的计时
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                zkp_future = executor.submit(self.run_zkp_experiment, orders)
+
+                experiment_results = {
+                    "shamir": self.run_shamir_experiment(orders, columns),
+                    "merkle": self.run_merkle_experiment(orders, columns)
+                }
+                experiment_results["zkp"] = zkp_future.result()
+                experiment_results["access_control"] = self.run_access_control_experiment(orders)
 
             self.end_time = time.time()
 
@@ -109,7 +118,16 @@ class DVSSExperimentRunner:
             print(f"Experiment failed: {e}")
             return {"error": str(e)}
 
-    def run_shamir_experiment(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _order_columns(orders: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """将订单列表转换为按字段分列的视图（订单ID、敏感度）"""
+        return {
+            "order_id": [order["order_id"] for order in orders],
+            "sensitivity": [order.get("sensitivity_score", 0.5) for order in orders]
+        }
+
+    def run_shamir_experiment(self, orders: List[Dict[str, Any]],
+                              columns: Dict[str, List[Any]] = None) -> Dict[str, Any]:
         """运行Shamir秘密共享实验"""
         print("\n1. Running Shamir Secret Sharing Experiment...")
 
@@ -119,14 +137,18 @@ class DVSSExperimentRunner:
             "performance": {}
         }
 
-        for i, order in enumerate(orders[:50]):  # 测试前50个订单
+        if columns is None:
+            columns = self._order_columns(orders)
+        order_ids = columns["order_id"][:50]  # 测试前50个订单
+        sensitivities = columns["sensitivity"][:50]
+
+        for i, (order_id, sensitivity) in enumerate(zip(order_ids, sensitivities)):
             # 模拟动态参数
-            sensitivity = order.get("sensitivity_score", 0.5)
             load = min(i / 50, 0.8)
             frequency = min((i % 10) / 10, 0.9)
 
             # 生成分片
-            secret = hash(order["order_id"]) % 1000000
+            secret = derive_secret(order_id)
             shares, commitment, k = self.shamir.share_secret(
                 secret=secret,
                 n=5,
@@ -139,7 +161,7 @@ class DVSSExperimentRunner:
             recovered = self.shamir.reconstruct_secret(shares[:k])
 
             operation_result = {
-                "order_id": order["order_id"],
+                "order_id": order_id,
                 "threshold": k,
                 "shares_count": len(shares),
                 "reconstruction_success": recovered == secret,
@@ -157,7 +179,8 @@ class DVSSExperimentRunner:
         print(f"Shamir experiment completed: {len(results['operations'])} operations")
         return results
 
-    def run_merkle_experiment(self, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def run_merkle_experiment(self, orders: List[Dict[str, Any]],
+                              columns: Dict[str, List[Any]] = None) -> Dict[str, Any]:
         """运行Merkle树验证实验"""
         print("\n2. Running Merkle Tree Experiment...")
 
@@ -168,20 +191,24 @@ class DVSSExperimentRunner:
         }
 
         # 构建Merkle树
-        order_data = [order["order_id"] for order in orders[:30]]
+        if columns is None:
+            columns = self._order_columns(orders)
+        order_data = columns["order_id"][:30]
         root_hash = self.merkle.build_tree(order_data)
 
-        # 验证测试
-        verification_results = []
-        for order_id in order_data[:10]:
-            proof = self.merkle.generate_proof(order_id)
-            is_valid = self.merkle.verify_proof(order_id, proof, root_hash)
+        # 验证测试（批量生成证明并批量验证，共享树的遍历与公共祖先哈希）
+        proofs = self.merkle.generate_proofs(order_data[:10])
+        proof_pairs = [(order_id, proofs[order_id]) for order_id in order_data[:10]]
+        validity = self.merkle.verify_proofs_batch(proof_pairs, root_hash)
 
-            verification_results.append({
+        verification_results = [
+            {
                 "order_id": order_id,
                 "proof_elements": len(proof),
                 "verification_success": is_valid
-            })
+            }
+            for (order_id, proof), is_valid in zip(proof_pairs, validity)
+        ]
 
         results["operations"] = verification_results
         results["tree_info"] = {
@@ -204,9 +231,11 @@ class DVSSExperimentRunner:
         }
 
         roles = ["merchant", "logistics", "payment", "admin"]
-        verification_results = []
+        test_orders = orders[:20]
+        proof_pairs = []
+        permission_sets = []
 
-        for i, order in enumerate(orders[:20]):
+        for i, order in enumerate(test_orders):
             role = roles[i % len(roles)]
             permissions = ["read", "update"] if role != "admin" else ["read", "write", "delete"]
 
@@ -216,16 +245,21 @@ class DVSSExperimentRunner:
                 role=role,
                 permissions=permissions
             )
+            proof_pairs.append((proof, role))
+            permission_sets.append(permissions)
 
-            # 验证证明
-            is_valid = self.zkp.verify_proof(proof, expected_role=role)
+        # 生成全部证明后统一验证
+        validity = self.zkp.batch_verify_proofs(proof_pairs)
 
-            verification_results.append({
+        verification_results = [
+            {
                 "order_id": order["order_id"],
                 "user_role": role,
                 "permissions": permissions,
                 "proof_valid": is_valid
-            })
+            }
+            for order, (_, role), permissions, is_valid in zip(test_orders, proof_pairs, permission_sets, validity)
+        ]
 
         results["operations"] = verification_results
 
@@ -327,8 +361,9 @@ class DVSSExperimentRunner:
             filename = f"dvss_ppa_experiment_{timestamp}.json"
             filepath = os.path.join(output_dir, filename)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            # orjson直接输出UTF-8字节（等价于ensure_ascii=False），保留两格缩进便于阅读
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
             print(f"\nResults saved to: {filepath}")
 
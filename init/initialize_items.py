@@ -13,7 +13,7 @@ Description:
 Dependencies:
     - storage.mysql_storage: MySQL数据存储模块
     - storage.redis_cache: Redis缓存存储模块  # 修改了模块名
-    - random: 随机数据生成
+    - numpy: 随机数据批量生成
     - logging: 初始化过程日志记录
     - typing: 类型注解支持
 
@@ -30,8 +30,8 @@ Usage:
     python initialize_items.py
 """
 
-import random
 import logging
+import numpy as np
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import json
@@ -101,47 +101,47 @@ class DVSSPPADataInitializer:
         Returns:
             List[Dict[str, Any]]: 商品数据列表
         """
-        items = []
-
-        print(f"Generating {self.item_count} product items for DVSS-PPA experiment...")
-
-        for i in range(1, self.item_count + 1):
-            # 生成SKU编号
-            sku = f"DVSS-SKU-{i:06d}"
-
-            # 随机选择商品类别
-            category = random.choice(self.product_categories)
-
-            # 生成商品名称
-            product_name = f"{category}-Product-{i:04d}"
-
-            # 生成商品属性
-            item = {
-                "sku": sku,
-                "name": product_name,
+        count = self.item_count
+        print(f"Generating {count} product items for DVSS-PPA experiment...")
+
+        # 按列一次性批量生成所有随机字段，组装阶段只做一次zip遍历
+        rng = np.random.default_rng()
+        categories = np.array(self.product_categories)[rng.integers(0, len(self.product_categories), count)].tolist()
+        quantities = rng.integers(10, 501, count).tolist()
+        prices = np.round(rng.uniform(9.99, 999.99, count), 2).tolist()
+        costs = np.round(rng.uniform(5.00, 500.00, count), 2).tolist()
+        weights = np.round(rng.uniform(0.1, 50.0, count), 2).tolist()
+        dimensions = np.round(rng.uniform(5, 100, (count, 3)), 1).tolist()
+        supplier_ids = rng.integers(1000, 10000, count).tolist()
+        privacy_levels = rng.choice(["public", "internal", "confidential"], count).tolist()
+        zk_flags = (rng.random(count) < 0.5).tolist()
+        created_at = datetime.now().isoformat()
+
+        items = [
+            {
+                "sku": f"DVSS-SKU-{i:06d}",
+                "name": f"{category}-Product-{i:04d}",
                 "category": category,
-                "quantity": random.randint(10, 500),
-                "price": round(random.uniform(9.99, 999.99), 2),
-                "cost": round(random.uniform(5.00, 500.00), 2),
-                "weight": round(random.uniform(0.1, 50.0), 2),
+                "quantity": quantity,
+                "price": price,
+                "cost": cost,
+                "weight": weight,
                 "dimensions": {
-                    "length": round(random.uniform(5, 100), 1),
-                    "width": round(random.uniform(5, 100), 1),
-                    "height": round(random.uniform(5, 100), 1)
+                    "length": length,
+                    "width": width,
+                    "height": height
                 },
                 "description": f"High-quality {category.lower()} product for testing DVSS-PPA privacy protection",
-                "supplier_id": f"SUP-{random.randint(1000, 9999)}",
-                "created_at": datetime.now().isoformat(),
-                "privacy_level": random.choice(["public", "internal", "confidential"]),
-                "requires_zk_proof": random.choice([True, False])
+                "supplier_id": f"SUP-{supplier_id}",
+                "created_at": created_at,
+                "privacy_level": privacy_level,
+                "requires_zk_proof": requires_zk_proof
             }
-
-            items.append(item)
-
-            # 显示进度
-            if i % 100 == 0:
-                progress = (i / self.item_count) * 100
-                print(f"Progress: {progress:.1f}% - Generated {i} items")
+            for i, (category, quantity, price, cost, weight, (length, width, height), supplier_id,
+                    privacy_level, requires_zk_proof) in enumerate(
+                zip(categories, quantities, prices, costs, weights, dimensions, supplier_ids,
+                    privacy_levels, zk_flags), 1)
+        ]
 
         logger.info(f"Generated {len(items)} product items")
         return items
@@ -156,71 +156,85 @@ class DVSSPPADataInitializer:
         Returns:
             List[Dict[str, Any]]: 订单数据列表
         """
-        orders = []
-
         print(f"Generating {order_count} order transactions...")
 
-        for i in range(1, order_count + 1):
-            # 生成订单基本信息
-            order_id = f"ORDER-{datetime.now().strftime('%Y%m%d')}-{i:06d}"
-
-            # 生成订单详情
-            item_count = random.randint(1, 5)
-            total_amount = 0
-            order_items = []
+        rng = np.random.default_rng()
+
+        # 订单明细：先抽取每单的明细数，再把全部明细作为一个扁平数组整批生成
+        item_counts = rng.integers(1, 6, order_count)
+        offsets = np.concatenate(([0], np.cumsum(item_counts))).tolist()
+        total_lines = offsets[-1]
+        line_skus = rng.integers(1, self.item_count + 1, total_lines).tolist()
+        line_quantities = rng.integers(1, 11, total_lines)
+        line_prices = np.round(rng.uniform(9.99, 999.99, total_lines), 2)
+        line_subtotals = line_quantities * line_prices
+        line_quantities = line_quantities.tolist()
+        line_prices = line_prices.tolist()
+        line_subtotals = line_subtotals.tolist()
+
+        customer_ids = rng.integers(10000, 100000, order_count).tolist()
+        merchant_ids = rng.integers(1000, 10000, order_count).tolist()
+        logistics_ids = rng.integers(100, 1000, order_count).tolist()
+        order_statuses = rng.choice(["pending", "confirmed", "shipped", "delivered"], order_count).tolist()
+        payment_statuses = rng.choice(["pending", "paid", "failed"], order_count).tolist()
+        streets = rng.integers(1, 1000, order_count).tolist()
+        cities = rng.choice(["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"], order_count).tolist()
+        states = rng.choice(["NY", "CA", "IL", "TX", "AZ"], order_count).tolist()
+        zip_codes = rng.integers(10000, 100000, order_count).tolist()
+        age_days = rng.integers(0, 31, order_count).tolist()
+        thresholds = rng.integers(2, 4, order_count).tolist()
+        share_counts = rng.integers(3, 6, order_count).tolist()
+
+        # 日期前缀与创建时间（只有31种取值）预先计算
+        now = datetime.now()
+        date_prefix = now.strftime('%Y%m%d')
+        created_dates = [(now - timedelta(days=days)).isoformat() for days in range(31)]
 
-            for j in range(item_count):
-                sku = f"DVSS-SKU-{random.randint(1, self.item_count):06d}"
-                quantity = random.randint(1, 10)
-                unit_price = round(random.uniform(9.99, 999.99), 2)
-                subtotal = quantity * unit_price
-                total_amount += subtotal
-
-                order_items.append({
-                    "sku": sku,
+        orders = []
+        for i in range(order_count):
+            start, end = offsets[i], offsets[i + 1]
+            order_items = [
+                {
+                    "sku": f"DVSS-SKU-{sku:06d}",
                     "quantity": quantity,
                     "unit_price": unit_price,
                     "subtotal": subtotal
-                })
-
-            # 生成订单数据
-            order = {
-                "order_id": order_id,
-                "customer_id": f"CUST-{random.randint(10000, 99999)}",
-                "merchant_id": f"MERCH-{random.randint(1000, 9999)}",
-                "logistics_id": f"LOG-{random.randint(100, 999)}",
+                }
+                for sku, quantity, unit_price, subtotal in zip(
+                    line_skus[start:end], line_quantities[start:end],
+                    line_prices[start:end], line_subtotals[start:end])
+            ]
+
+            orders.append({
+                "order_id": f"ORDER-{date_prefix}-{i + 1:06d}",
+                "customer_id": f"CUST-{customer_ids[i]}",
+                "merchant_id": f"MERCH-{merchant_ids[i]}",
+                "logistics_id": f"LOG-{logistics_ids[i]}",
                 "order_items": order_items,
-                "total_amount": round(total_amount, 2),
+                "total_amount": round(sum(line_subtotals[start:end]), 2),
                 "currency": "USD",
-                "order_status": random.choice(["pending", "confirmed", "shipped", "delivered"]),
-                "payment_status": random.choice(["pending", "paid", "failed"]),
+                "order_status": order_statuses[i],
+                "payment_status": payment_statuses[i],
                 "shipping_address": {
-                    "street": f"Test Street {random.randint(1, 999)}",
-                    "city": random.choice(["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"]),
-                    "state": random.choice(["NY", "CA", "IL", "TX", "AZ"]),
-                    "zip_code": f"{random.randint(10000, 99999)}",
+                    "street": f"Test Street {streets[i]}",
+                    "city": cities[i],
+                    "state": states[i],
+                    "zip_code": f"{zip_codes[i]}",
                     "country": "USA"
                 },
-                "created_at": (datetime.now() - timedelta(days=random.randint(0, 30))).isoformat(),
+                "created_at": created_dates[age_days[i]],
                 "privacy_requirements": {
                     "merchant_access": ["items", "order_amount", "customer_contact"],
                     "logistics_access": ["shipping_address", "delivery_time", "tracking_number"],
                     "customer_access": ["order_status", "payment_status", "delivery_progress"]
                 },
                 "requires_secret_sharing": True,
-                "shamir_threshold": random.randint(2, 3),
-                "shamir_shares": random.randint(3, 5),
+                "shamir_threshold": thresholds[i],
+                "shamir_shares": share_counts[i],
                 # 添加可能需要的字段，避免数据库插入错误
                 "merkle_root": None,
                 "zk_proof_hash": None
-            }
-
-            orders.append(order)
-
-            # 显示进度
-            if i % 50 == 0:
-                progress = (i / order_count) * 100
-                print(f"Order generation progress: {progress:.1f}% - Generated {i} orders")
+            })
 
         logger.info(f"Generated {len(orders)} order transactions")
         return orders
@@ -235,44 +249,50 @@ class DVSSPPADataInitializer:
         Returns:
             List[Dict[str, Any]]: 用户数据列表
         """
-        users = []
-
         print(f"Generating {user_count} user accounts...")
 
-        for i in range(1, user_count + 1):
-            # 随机分配角色
-            role = random.choice(self.user_roles)
-
-            # 生成用户ID
-            if role == "merchant":
-                user_id = f"MERCH-{i:04d}"
-                organization = random.choice(["PrivacyOrg1", "PrivacyOrg2", "PrivacyOrg3"])
-            elif role == "logistics":
-                user_id = f"LOG-{i:04d}"
-                organization = random.choice(["PrivacyOrg2", "PrivacyOrg3"])
-            else:  # customer
-                user_id = f"CUST-{i:05d}"
-                organization = random.choice(["PrivacyOrg1", "PrivacyOrg2", "PrivacyOrg3"])
-
-            user = {
-                "user_id": user_id,
+        # 各角色的ID格式与可选组织
+        role_profiles = {
+            "merchant": ("MERCH-{:04d}", ("PrivacyOrg1", "PrivacyOrg2", "PrivacyOrg3")),
+            "logistics": ("LOG-{:04d}", ("PrivacyOrg2", "PrivacyOrg3")),
+            "customer": ("CUST-{:05d}", ("PrivacyOrg1", "PrivacyOrg2", "PrivacyOrg3"))
+        }
+
+        rng = np.random.default_rng()
+        roles = rng.choice(self.user_roles, user_count).tolist()
+        organization_picks = rng.random(user_count).tolist()
+        login_days = rng.integers(0, 8, user_count).tolist()
+        consents = (rng.random((user_count, 3)) < 0.5).tolist()
+        zk_keys = rng.integers(100000, 1000000, user_count).tolist()
+        access_levels = rng.choice(["basic", "standard", "premium"], user_count).tolist()
+
+        now = datetime.now()
+        created_at = now.isoformat()
+        login_dates = [(now - timedelta(days=days)).isoformat() for days in range(8)]
+        role_permissions = {role: self._get_role_permissions(role) for role in role_profiles}
+
+        users = []
+        for i, (role, pick, login_day, (sharing, analytics, marketing), zk_key, access_level) in enumerate(
+                zip(roles, organization_picks, login_days, consents, zk_keys, access_levels), 1):
+            id_format, organizations = role_profiles.get(role, role_profiles["customer"])
+
+            users.append({
+                "user_id": id_format.format(i),
                 "username": f"user_{i:05d}",
                 "email": f"user{i}@dvssppa-test.com",
                 "role": role,
-                "organization": organization,
-                "permissions": self._get_role_permissions(role),
-                "created_at": datetime.now().isoformat(),
-                "last_login": (datetime.now() - timedelta(days=random.randint(0, 7))).isoformat(),
+                "organization": organizations[int(pick * len(organizations))],
+                "permissions": list(role_permissions.get(role, [])),
+                "created_at": created_at,
+                "last_login": login_dates[login_day],
                 "privacy_preferences": {
-                    "data_sharing_consent": random.choice([True, False]),
-                    "analytics_consent": random.choice([True, False]),
-                    "marketing_consent": random.choice([True, False])
+                    "data_sharing_consent": sharing,
+                    "analytics_consent": analytics,
+                    "marketing_consent": marketing
                 },
-                "zk_public_key": f"zk_pub_{random.randint(100000, 999999)}",
-                "access_level": random.choice(["basic", "standard", "premium"])
-            }
-
-            users.append(user)
+                "zk_public_key": f"zk_pub_{zk_key}",
+                "access_level": access_level
+            })
 
         logger.info(f"Generated {len(users)} user accounts")
         return users
@@ -312,30 +332,18 @@ class DVSSPPADataInitializer:
                 print(f"Would save {len(data)} {data_type} records to MySQL")
                 return True
 
-            save_count = 0
-
-            for item in data:
-                try:
-                    if data_type == "items":
-                        success = self.mysql_storage.save_item(item)
-                    elif data_type == "orders":
-                        success = self.mysql_storage.save_order(item)
-                    elif data_type == "users":
-                        success = self.mysql_storage.save_user(item)
-                    else:
-                        continue
-
-                    if success:  # 只有成功时才计数
-                        save_count += 1
-
-                    # 显示保存进度
-                    if save_count % 100 == 0:
-                        progress = (save_count / len(data)) * 100
-                        print(f"Saving {data_type}: {progress:.1f}% - Saved {save_count} records")
-
-                except Exception as e:
-                    logger.error(f"Failed to save {data_type} record: {str(e)}")
-                    continue
+            # 整批交给存储层executemany分块写入（每批500行），单个事务提交
+            batch_savers = {
+                "items": self.mysql_storage.save_item_batch,
+                "orders": self.mysql_storage.save_order_batch,
+                "users": self.mysql_storage.save_user_batch
+            }
+            save_batch = batch_savers.get(data_type)
+            if save_batch is None:
+                logger.warning(f"Unknown data type: {data_type}")
+                return False
+
+            save_count = save_batch(data)
 
             self.initialized_data_count += save_count
             logger.info(f"Successfully saved {save_count} {data_type} records")
@@ -8,6 +8,21 @@ Description: 数据验证模块
 """
 
 import re
+from typing import Optional
+
+# 订单必需字段（validate_order 与 validate_and_normalize 共用同一规则）
+_ORDER_REQUIRED_FIELDS = ('order_id', 'customer_id', 'merchant_id', 'order_items', 'total_amount')
+
+
+def _parse_amount(value) -> tuple:
+    """解析订单金额，返回(金额, 错误信息)；金额无效时金额为None"""
+    try:
+        amount = float(value)
+    except (ValueError, TypeError):
+        return None, "Invalid total_amount format"
+    if amount <= 0:
+        return None, "Total amount must be positive"
+    return amount, None
 
 
 class DataValidator:
@@ -18,22 +33,31 @@ class DataValidator:
         errors = []
 
         # 必需字段检查
-        required_fields = ['order_id', 'customer_id', 'merchant_id', 'order_items', 'total_amount']
-        for field in required_fields:
+        for field in _ORDER_REQUIRED_FIELDS:
             if field not in order_data:
                 errors.append(f"Missing required field: {field}")
 
         # 金额验证
         if 'total_amount' in order_data:
-            try:
-                amount = float(order_data['total_amount'])
-                if amount <= 0:
-                    errors.append("Total amount must be positive")
-            except (ValueError, TypeError):
-                errors.append("Invalid total_amount format")
+            _, error = _parse_amount(order_data['total_amount'])
+            if error:
+                errors.append(error)
 
         return len(errors) == 0, errors
 
+    def validate_and_normalize(self, order_data: dict) -> Optional[dict]:
+        """按 validate_order 的规则验证订单并原地格式化金额，无效时返回None（遇到首个错误即返回，不收集错误信息）"""
+        for field in _ORDER_REQUIRED_FIELDS:
+            if field not in order_data:
+                return None
+
+        amount, _ = _parse_amount(order_data['total_amount'])
+        if amount is None:
+            return None
+
+        order_data['total_amount'] = round(amount, 2)
+        return order_data
+
     def validate_experiment_result(self, result_data: dict) -> tuple:
         """验证实验结果数据"""
         errors = []
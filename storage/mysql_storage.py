@@ -8,14 +8,65 @@ Description: MySQL存储实现 - 使用数据库行锁而非Python线程锁
 """
 
 import pymysql
-import json
+import orjson
 import logging
 import time
-from config.settings import MYSQL_CONFIG
+import queue
+import threading
+from contextlib import contextmanager
+from config.settings import MYSQL_CONFIG, MYSQL_POOL_SIZE
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps_json(value) -> str:
+    """序列化JSON字段（orjson在C层编码，非ASCII字符原样保留，原生支持datetime）"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+# 订单/商品/用户的UPSERT语句，单条保存与批量保存共用
+# （INSERT ... ON DUPLICATE KEY UPDATE避免锁冲突）
+_ORDER_UPSERT_QUERY = """
+                    INSERT INTO orders (order_id, customer_id, merchant_id, logistics_id, order_items,
+                                        total_amount, currency, order_status, payment_status, shipping_address,
+                                        privacy_requirements, requires_secret_sharing, shamir_threshold,
+                                        shamir_shares, merkle_root, zk_proof_hash)
+                    VALUES (%(order_id)s, %(customer_id)s, %(merchant_id)s, %(logistics_id)s, %(order_items)s,
+                            %(total_amount)s, %(currency)s, %(order_status)s, %(payment_status)s, %(shipping_address)s,
+                            %(privacy_requirements)s, %(requires_secret_sharing)s, %(shamir_threshold)s,
+                            %(shamir_shares)s, %(merkle_root)s, %(zk_proof_hash)s) ON DUPLICATE KEY \
+                    UPDATE \
+                        order_status = \
+                    VALUES (order_status), payment_status = \
+                    VALUES (payment_status), total_amount = \
+                    VALUES (total_amount), updated_at = CURRENT_TIMESTAMP \
+                    """
+
+_ITEM_UPSERT_QUERY = """
+                    INSERT INTO items (sku, name, category, quantity, price, cost, weight, dimensions,
+                                       description, supplier_id, privacy_level, requires_zk_proof)
+                    VALUES (%(sku)s, %(name)s, %(category)s, %(quantity)s, %(price)s, %(cost)s, %(weight)s,
+                            %(dimensions)s, %(description)s, %(supplier_id)s, %(privacy_level)s, %(requires_zk_proof)s) ON DUPLICATE KEY \
+                    UPDATE \
+                        name = \
+                    VALUES (name), price = \
+                    VALUES (price), updated_at = CURRENT_TIMESTAMP \
+                    """
+
+_USER_UPSERT_QUERY = """
+                    INSERT INTO users (user_id, username, email, role, organization, permissions,
+                                       privacy_preferences, zk_public_key, access_level, last_login)
+                    VALUES (%(user_id)s, %(username)s, %(email)s, %(role)s, %(organization)s, %(permissions)s,
+                            %(privacy_preferences)s, %(zk_public_key)s, %(access_level)s, %(last_login)s) ON DUPLICATE KEY \
+                    UPDATE \
+                        username = \
+                    VALUES (username), email = \
+                    VALUES (email), role = \
+                    VALUES (role), organization = \
+                    VALUES (organization), updated_at = CURRENT_TIMESTAMP \
+                    """
+
+
 class MySQLStorage:
     """MySQL数据存储类 - 使用数据库行锁"""
 
@@ -27,6 +78,11 @@ class MySQLStorage:
         self.connection_retries = 3
         self.retry_delay = 1
 
+        # 单行写入使用的连接池（pymysql连接非线程安全，多线程按需取用独立连接）
+        self._pool = queue.LifoQueue()
+        self._pool_created = 0
+        self._pool_lock = threading.Lock()
+
         try:
             self._connect()
             self._initialize_tables()
@@ -47,19 +103,7 @@ class MySQLStorage:
                     except:
                         pass
 
-                temp_config = MYSQL_CONFIG.copy()
-                database_name = temp_config.pop('database')
-
-                # 连接配置 - 关闭autocommit以支持事务和行锁
-                enhanced_config = {
-                    **temp_config,
-                    'connect_timeout': 10,
-                    'read_timeout': 30,
-                    'write_timeout': 30,
-                    'autocommit': False,  # 关闭自动提交，支持行锁
-                    'charset': 'utf8mb4',
-                    'cursorclass': pymysql.cursors.DictCursor
-                }
+                enhanced_config, database_name = self._connection_config()
 
                 self.conn = pymysql.connect(**enhanced_config)
                 self.cursor = self.conn.cursor()
@@ -85,6 +129,71 @@ class MySQLStorage:
                 else:
                     raise
 
+    @staticmethod
+    def _connection_config():
+        """构建连接参数，返回(不含库名的连接配置, 库名)"""
+        temp_config = MYSQL_CONFIG.copy()
+        database_name = temp_config.pop('database')
+
+        # 连接配置 - 关闭autocommit以支持事务和行锁
+        enhanced_config = {
+            **temp_config,
+            'connect_timeout': 10,
+            'read_timeout': 30,
+            'write_timeout': 30,
+            'autocommit': False,  # 关闭自动提交，支持行锁
+            'charset': 'utf8mb4',
+            'cursorclass': pymysql.cursors.DictCursor
+        }
+        return enhanced_config, database_name
+
+    @contextmanager
+    def _pooled_connection(self):
+        """从连接池借出连接，用完归还；出错的连接直接关闭丢弃"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_create = self._pool_created < MYSQL_POOL_SIZE
+                if can_create:
+                    self._pool_created += 1
+            if can_create:
+                try:
+                    config, database_name = self._connection_config()
+                    conn = pymysql.connect(**config, database=database_name)
+                except Exception:
+                    with self._pool_lock:
+                        self._pool_created -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._pool_lock:
+                self._pool_created -= 1
+            raise
+        else:
+            self._pool.put(conn)
+
+    def _execute_pooled(self, query: str, params: dict):
+        """使用连接池中的连接执行单条写入并提交"""
+        with self._pooled_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(query, params)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        with self._pool_lock:
+            self.operations_count += 1
+
     def _ensure_connection(self):
         """确保数据库连接有效"""
         try:
@@ -435,95 +544,23 @@ class MySQLStorage:
             return False
 
         try:
-            self._ensure_connection()
-
             # 开始事务
             processed_data = self._prepare_order_data(order_data)
 
-            # 使用INSERT ... ON DUPLICATE KEY UPDATE避免锁冲突
-            query = """
-                    INSERT INTO orders (order_id, customer_id, merchant_id, logistics_id, order_items,
-                                        total_amount, currency, order_status, payment_status, shipping_address,
-                                        privacy_requirements, requires_secret_sharing, shamir_threshold,
-                                        shamir_shares, merkle_root, zk_proof_hash)
-                    VALUES (%(order_id)s, %(customer_id)s, %(merchant_id)s, %(logistics_id)s, %(order_items)s,
-                            %(total_amount)s, %(currency)s, %(order_status)s, %(payment_status)s, %(shipping_address)s,
-                            %(privacy_requirements)s, %(requires_secret_sharing)s, %(shamir_threshold)s,
-                            %(shamir_shares)s, %(merkle_root)s, %(zk_proof_hash)s) ON DUPLICATE KEY \
-                    UPDATE \
-                        order_status = \
-                    VALUES (order_status), payment_status = \
-                    VALUES (payment_status), total_amount = \
-                    VALUES (total_amount), updated_at = CURRENT_TIMESTAMP \
-                    """
-
-            self.cursor.execute(query, processed_data)
-            self.conn.commit()  # 提交事务，释放行锁
-            self.operations_count += 1
+            self._execute_pooled(_ORDER_UPSERT_QUERY, processed_data)  # 提交事务，释放行锁
             return True
 
         except pymysql.MySQLError as e:
-            self.conn.rollback()  # 回滚事务
             logger.error(f"MySQL error saving order {order_data.get('order_id', 'Unknown')}: "
                          f"Error {e.args[0] if e.args else 'Unknown'}: {e.args[1] if len(e.args) > 1 else 'No message'}")
             return False
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Unexpected error saving order {order_data.get('order_id', 'Unknown')}: {str(e)}")
             return False
 
     def save_order_batch(self, orders_list: list) -> int:
-        """批量保存订单 - 使用单个事务提高性能"""
-        if not self.is_connected or not orders_list:
-            return 0
-
-        saved_count = 0
-        try:
-            self._ensure_connection()
-
-            # 批量插入查询
-            query = """
-                    INSERT INTO orders (order_id, customer_id, merchant_id, logistics_id, order_items,
-                                        total_amount, currency, order_status, payment_status, shipping_address,
-                                        privacy_requirements, requires_secret_sharing, shamir_threshold,
-                                        shamir_shares, merkle_root, zk_proof_hash)
-                    VALUES (%(order_id)s, %(customer_id)s, %(merchant_id)s, %(logistics_id)s, %(order_items)s,
-                            %(total_amount)s, %(currency)s, %(order_status)s, %(payment_status)s, %(shipping_address)s,
-                            %(privacy_requirements)s, %(requires_secret_sharing)s, %(shamir_threshold)s,
-                            %(shamir_shares)s, %(merkle_root)s, %(zk_proof_hash)s) ON DUPLICATE KEY \
-                    UPDATE \
-                        order_status = \
-                    VALUES (order_status), total_amount = \
-                    VALUES (total_amount) \
-                    """
-
-            # 分批处理，每批100个
-            batch_size = 100
-            for i in range(0, len(orders_list), batch_size):
-                batch = orders_list[i:i + batch_size]
-                processed_batch = []
-
-                for order_data in batch:
-                    try:
-                        processed_data = self._prepare_order_data(order_data)
-                        processed_batch.append(processed_data)
-                    except Exception as e:
-                        logger.warning(f"Skipping invalid order {order_data.get('order_id', 'Unknown')}: {str(e)}")
-                        continue
-
-                if processed_batch:
-                    self.cursor.executemany(query, processed_batch)
-                    saved_count += len(processed_batch)
-
-            self.conn.commit()  # 一次性提交所有批次
-            self.operations_count += saved_count
-            logger.info(f"Batch saved {saved_count}/{len(orders_list)} orders")
-            return saved_count
-
-        except Exception as e:
-            self.conn.rollback()
-            logger.error(f"Batch save failed: {str(e)}")
-            return saved_count
+        """批量保存订单 - executemany分批写入，单个事务提交"""
+        return self._save_batch(_ORDER_UPSERT_QUERY, orders_list, self._prepare_order_data, 'order_id', 'orders')
 
     def _prepare_order_data(self, order_data: dict) -> dict:
         """准备订单数据"""
@@ -553,17 +590,17 @@ class MySQLStorage:
             for field in json_fields:
                 if field in order_data:
                     if isinstance(order_data[field], (list, dict)):
-                        processed_data[field] = json.dumps(order_data[field], ensure_ascii=False)
+                        processed_data[field] = _dumps_json(order_data[field])
                     else:
                         processed_data[field] = str(order_data[field])
                 else:
-                    processed_data[field] = json.dumps({} if field != 'order_items' else [])
+                    processed_data[field] = _dumps_json({} if field != 'order_items' else [])
 
         except Exception as e:
             logger.error(f"Error processing JSON fields: {str(e)}")
-            processed_data['order_items'] = json.dumps([])
-            processed_data['shipping_address'] = json.dumps({})
-            processed_data['privacy_requirements'] = json.dumps({})
+            processed_data['order_items'] = _dumps_json([])
+            processed_data['shipping_address'] = _dumps_json({})
+            processed_data['privacy_requirements'] = _dumps_json({})
 
         return processed_data
 
@@ -573,41 +610,12 @@ class MySQLStorage:
             return False
 
         try:
-            self._ensure_connection()
-
-            processed_data = {
-                'user_id': user_data.get('user_id'),
-                'username': user_data.get('username'),
-                'email': user_data.get('email', ''),
-                'role': user_data.get('role'),
-                'organization': user_data.get('organization', ''),
-                'permissions': json.dumps(user_data.get('permissions', {}), ensure_ascii=False),
-                'privacy_preferences': json.dumps(user_data.get('privacy_preferences', {}), ensure_ascii=False),
-                'zk_public_key': user_data.get('zk_public_key', ''),
-                'access_level': user_data.get('access_level', 'basic'),
-                'last_login': user_data.get('last_login')
-            }
-
-            query = """
-                    INSERT INTO users (user_id, username, email, role, organization, permissions,
-                                       privacy_preferences, zk_public_key, access_level, last_login)
-                    VALUES (%(user_id)s, %(username)s, %(email)s, %(role)s, %(organization)s, %(permissions)s,
-                            %(privacy_preferences)s, %(zk_public_key)s, %(access_level)s, %(last_login)s) ON DUPLICATE KEY \
-                    UPDATE \
-                        username = \
-                    VALUES (username), email = \
-                    VALUES (email), role = \
-                    VALUES (role), organization = \
-                    VALUES (organization), updated_at = CURRENT_TIMESTAMP \
-                    """
+            processed_data = self._prepare_user_data(user_data)
 
-            self.cursor.execute(query, processed_data)
-            self.conn.commit()
-            self.operations_count += 1
+            self._execute_pooled(_USER_UPSERT_QUERY, processed_data)
             return True
 
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Failed to save user {user_data.get('user_id', 'Unknown')}: {str(e)}")
             return False
 
@@ -616,44 +624,87 @@ class MySQLStorage:
         if not self.is_connected:
             return False
 
+        try:
+            processed_data = self._prepare_item_data(item_data)
+
+            self._execute_pooled(_ITEM_UPSERT_QUERY, processed_data)
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to save item {item_data.get('sku', 'Unknown')}: {str(e)}")
+            return False
+
+    def save_user_batch(self, users_list: list) -> int:
+        """批量保存用户 - executemany分批写入，单个事务提交"""
+        return self._save_batch(_USER_UPSERT_QUERY, users_list, self._prepare_user_data, 'user_id', 'users')
+
+    def save_item_batch(self, items_list: list) -> int:
+        """批量保存商品 - executemany分批写入，单个事务提交"""
+        return self._save_batch(_ITEM_UPSERT_QUERY, items_list, self._prepare_item_data, 'sku', 'items')
+
+    def _save_batch(self, query: str, records: list, prepare, key_field: str, label: str,
+                    batch_size: int = 500) -> int:
+        """按批次executemany写入记录，全部批次完成后一次性提交"""
+        if not self.is_connected or not records:
+            return 0
+
+        saved_count = 0
         try:
             self._ensure_connection()
 
-            processed_data = {
-                'sku': item_data.get('sku'),
-                'name': item_data.get('name'),
-                'category': item_data.get('category', ''),
-                'quantity': int(item_data.get('quantity', 0)),
-                'price': float(item_data.get('price', 0.0)),
-                'cost': float(item_data.get('cost', 0.0)),
-                'weight': float(item_data.get('weight', 0.0)),
-                'dimensions': json.dumps(item_data.get('dimensions', {}), ensure_ascii=False),
-                'description': item_data.get('description', ''),
-                'supplier_id': item_data.get('supplier_id', ''),
-                'privacy_level': item_data.get('privacy_level', 'public'),
-                'requires_zk_proof': bool(item_data.get('requires_zk_proof', False))
-            }
+            for i in range(0, len(records), batch_size):
+                processed_batch = []
+                for record in records[i:i + batch_size]:
+                    try:
+                        processed_batch.append(prepare(record))
+                    except Exception as e:
+                        logger.warning(f"Skipping invalid {label} record {record.get(key_field, 'Unknown')}: {str(e)}")
 
-            query = """
-                    INSERT INTO items (sku, name, category, quantity, price, cost, weight, dimensions,
-                                       description, supplier_id, privacy_level, requires_zk_proof)
-                    VALUES (%(sku)s, %(name)s, %(category)s, %(quantity)s, %(price)s, %(cost)s, %(weight)s,
-                            %(dimensions)s, %(description)s, %(supplier_id)s, %(privacy_level)s, %(requires_zk_proof)s) ON DUPLICATE KEY \
-                    UPDATE \
-                        name = \
-                    VALUES (name), price = \
-                    VALUES (price), updated_at = CURRENT_TIMESTAMP \
-                    """
+                if processed_batch:
+                    self.cursor.executemany(query, processed_batch)
+                    saved_count += len(processed_batch)
 
-            self.cursor.execute(query, processed_data)
             self.conn.commit()
-            self.operations_count += 1
-            return True
+            self.operations_count += saved_count
+            logger.info(f"Batch saved {saved_count}/{len(records)} {label}")
+            return saved_count
 
         except Exception as e:
             self.conn.rollback()
-            logger.error(f"Failed to save item {item_data.get('sku', 'Unknown')}: {str(e)}")
-            return False
+            logger.error(f"Batch save of {label} failed: {str(e)}")
+            return 0
+
+    def _prepare_user_data(self, user_data: dict) -> dict:
+        """准备用户数据"""
+        return {
+            'user_id': user_data.get('user_id'),
+            'username': user_data.get('username'),
+            'email': user_data.get('email', ''),
+            'role': user_data.get('role'),
+            'organization': user_data.get('organization', ''),
+            'permissions': _dumps_json(user_data.get('permissions', {})),
+            'privacy_preferences': _dumps_json(user_data.get('privacy_preferences', {})),
+            'zk_public_key': user_data.get('zk_public_key', ''),
+            'access_level': user_data.get('access_level', 'basic'),
+            'last_login': user_data.get('last_login')
+        }
+
+    def _prepare_item_data(self, item_data: dict) -> dict:
+        """准备商品数据"""
+        return {
+            'sku': item_data.get('sku'),
+            'name': item_data.get('name'),
+            'category': item_data.get('category', ''),
+            'quantity': int(item_data.get('quantity', 0)),
+            'price': float(item_data.get('price', 0.0)),
+            'cost': float(item_data.get('cost', 0.0)),
+            'weight': float(item_data.get('weight', 0.0)),
+            'dimensions': _dumps_json(item_data.get('dimensions', {})),
+            'description': item_data.get('description', ''),
+            'supplier_id': item_data.get('supplier_id', ''),
+            'privacy_level': item_data.get('privacy_level', 'public'),
+            'requires_zk_proof': bool(item_data.get('requires_zk_proof', False))
+        }
 
     def save_experiment_result(self, result_data: dict) -> bool:
         """保存实验结果"""
@@ -672,8 +723,8 @@ class MySQLStorage:
                 'memory_usage': float(result_data.get('memory_usage', 0.0)) if result_data.get('memory_usage') else None,
                 'cpu_usage': float(result_data.get('cpu_usage', 0.0)) if result_data.get('cpu_usage') else None,
                 'privacy_score': float(result_data.get('privacy_score', 0.0)) if result_data.get('privacy_score') else None,
-                'parameters': json.dumps(result_data.get('parameters', {}), ensure_ascii=False),
-                'results': json.dumps(result_data.get('results', {}), ensure_ascii=False)
+                'parameters': _dumps_json(result_data.get('parameters', {})),
+                'results': _dumps_json(result_data.get('results', {}))
             }
 
             query = """
@@ -728,6 +779,12 @@ class MySQLStorage:
                 self.cursor.close()
             if self.conn:
                 self.conn.close()
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._pool_created = 0
             self.is_connected = False
             logger.info(f"MySQL connection closed, operations: {self.operations_count}")
         except Exception as e:
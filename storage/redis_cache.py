@@ -8,7 +8,7 @@ Description: Redis缓存实现
 """
 
 import redis
-import json
+import orjson
 import logging
 from config.settings import REDIS_CONFIG
 
@@ -35,7 +35,7 @@ class RedisCache:
     def set(self, key: str, value, expiry: int = 3600) -> bool:
         """设置缓存值"""
         try:
-            serialized_value = json.dumps(value)
+            serialized_value = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
             self.redis_conn.setex(key, expiry, serialized_value)
             return True
         except Exception as e:
@@ -47,7 +47,7 @@ class RedisCache:
         try:
             value = self.redis_conn.get(key)
             if value:
-                return json.loads(value)
+                return orjson.loads(value)
             return None
         except Exception as e:
             logger.error(f"Failed to get cache key {key}: {str(e)}")
@@ -7,9 +7,11 @@ Created: 2025-06-13 08:47:13
 Description: 工具函数
 """
 
+import zlib
+import json
 import hashlib
 import time
-import json
+import orjson
 from typing import Any, Dict
 
 
@@ -19,13 +21,33 @@ def generate_id(prefix: str) -> str:
     return f"{prefix}_{timestamp}"
 
 
+def _json_default(obj):
+    """orjson不直接支持的类型：NumPy标量等提供item()的对象转换为对应的Python值"""
+    item = getattr(obj, "item", None)
+    if callable(item):
+        return item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 def hash_data(data: Any) -> str:
     """计算数据哈希"""
-    if isinstance(data, dict):
-        data_str = json.dumps(data, sort_keys=True)
+    if isinstance(data, (dict, list)):
+        # orjson在C层完成规范化序列化（键排序），结果与插入顺序无关；
+        # 与json.dumps(sort_keys=True)一样接受非字符串键
+        try:
+            payload = orjson.dumps(data, default=_json_default,
+                                   option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson不支持超过64位的整数（如Shamir份额），回退到标准库json
+            payload = json.dumps(data, sort_keys=True, default=_json_default).encode()
     else:
-        data_str = str(data)
-    return hashlib.sha256(data_str.encode()).hexdigest()
+        payload = str(data).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def derive_secret(order_id: str, modulus: int = 1000000) -> int:
+    """由订单ID派生实验用数值秘密（CRC32，跨进程稳定，不受PYTHONHASHSEED影响）"""
+    return zlib.crc32(order_id.encode()) % modulus
 
 
 def calculate_metrics(data_list: list) -> Dict[str, float]: